@@ -0,0 +1,134 @@
+"""Rule table behind the advice shown with each stress assessment.
+
+Every ``Rule`` names the stress level and category it belongs to and may be
+restricted to bands of sleep quality, activity level, age and sleep
+disorder. ``AdviceCatalogue`` indexes the table once; the advice and its
+rendered HTML are then built at most once per (level, bands) combination and
+served from a dict afterwards, so the catalogue can grow without slowing
+down the response.
+"""
+import bisect
+import functools
+import html
+from dataclasses import dataclass
+
+# (upper bound, label) pairs; an answer falls in the first band whose bound it does not exceed
+SLEEP_QUALITY_BANDS = ((4, "1-4"), (7, "5-7"), (10, "8-10"))
+ACTIVITY_BANDS = ((3, "1-3"), (6, "4-6"), (10, "7-10"))
+AGE_BANDS = ((29, "18-29"), (44, "30-44"), (59, "45-59"), (float("inf"), "60+"))
+
+BAND_KEYS = ("sleep_quality", "activity", "age", "sleep_disorder")
+
+
+def band(value, bands):
+    """Label of the band ``value`` falls in."""
+    bounds = [bound for bound, _ in bands]
+    return bands[min(bisect.bisect_left(bounds, value), len(bands) - 1)][1]
+
+
+def answer_bands(user_data):
+    """The bands of a set of answers, in ``BAND_KEYS`` order."""
+    return (
+        band(user_data['sleep_quality'], SLEEP_QUALITY_BANDS),
+        band(user_data['activity_level'], ACTIVITY_BANDS),
+        band(user_data['age'], AGE_BANDS),
+        user_data['sleep_disorder'],
+    )
+
+
+@dataclass(frozen=True)
+class Rule:
+    """One tip; a condition of None matches every band, otherwise a tuple of band labels.
+
+    ``text`` may refer to the matched bands as ``{sleep_quality}``,
+    ``{activity}``, ``{age}`` and ``{sleep_disorder}``.
+    """
+    level: str
+    category: str
+    text: str
+    sleep_quality: tuple = None
+    activity: tuple = None
+    age: tuple = None
+    sleep_disorder: tuple = None
+
+    def matches(self, bands):
+        return all(getattr(self, key) is None or value in getattr(self, key) for key, value in zip(BAND_KEYS, bands))
+
+
+class AdviceCatalogue:
+    """Rules grouped by level once; advice and HTML memoized per (level, bands)."""
+
+    def __init__(self, rules):
+        self.rules = tuple(rules)
+        self._by_level = {}
+        for rule in self.rules:
+            self._by_level.setdefault(rule.level, []).append(rule)
+        self.advice = functools.lru_cache(maxsize=None)(self._advice)
+        self.html = functools.lru_cache(maxsize=None)(self._html)
+
+    def _advice(self, level, bands):
+        """``{category: [tip, ...]}`` in catalogue order for ``level`` and ``bands``."""
+        values = dict(zip(BAND_KEYS, bands))
+        advice = {}
+        for rule in self._by_level[level]:
+            if rule.matches(bands):
+                advice.setdefault(rule.category, []).append(rule.text.format(**values))
+        # Shared by every session with these bands, so handed out read-only
+        return {category: tuple(tips) for category, tips in advice.items()}
+
+    def _html(self, level, bands):
+        """One advice box of HTML per category."""
+        return tuple(
+            f"<div class='advice-box'><h3>{html.escape(category)}</h3><ul>"
+            + "".join(f"<li>{html.escape(tip, quote=False)}</li>" for tip in tips)
+            + "</ul></div>"
+            for category, tips in self.advice(level, bands).items()
+        )
+
+    def cache_info(self):
+        return {"advice": self.advice.cache_info(), "html": self.html.cache_info()}
+
+
+RULES = (
+    Rule("High", "Immediate Actions", "Take deep breaths for 5 minutes every hour"),
+    Rule("High", "Immediate Actions", "Step away from stressful situations when possible"),
+    Rule("High", "Immediate Actions", "Practice the 5-4-3-2-1 grounding technique"),
+    Rule("High", "Daily Practices",
+         "With an activity level in the {activity} range (out of 10), gradually increase physical activity"),
+    Rule("High", "Daily Practices",
+         "With sleep quality in the {sleep_quality} range (out of 10), focus on sleep hygiene"),
+    Rule("High", "Daily Practices", "Maintain a stress journal to identify triggers"),
+    Rule("High", "Daily Practices", "Practice progressive muscle relaxation before bed"),
+    Rule("High", "Long-term Strategies", "Consider professional counseling or therapy"),
+    Rule("High", "Long-term Strategies", "Join stress management workshops"),
+    Rule("High", "Long-term Strategies", "Build a support network"),
+    Rule("High", "Long-term Strategies", "Learn time management techniques"),
+    Rule("High", "Lifestyle Modifications", "Reduce caffeine and processed foods"),
+    Rule("High", "Lifestyle Modifications", "Create a calming morning routine"),
+    Rule("High", "Lifestyle Modifications", "Set boundaries in work and personal life"),
+    Rule("High", "Lifestyle Modifications", "Take up a relaxing hobby like gardening or painting"),
+
+    Rule("Medium", "Daily Practices", "15-minute morning meditation"),
+    Rule("Medium", "Daily Practices", "Choose an exercise routine suited to your age group ({age})"),
+    Rule("Medium", "Daily Practices", "Regular breaks during work"),
+    Rule("Medium", "Daily Practices", "Nature walks or outdoor time"),
+    Rule("Medium", "Wellness Tips", "Practice mindful eating"),
+    Rule("Medium", "Wellness Tips", "Maintain a gratitude journal"),
+    Rule("Medium", "Wellness Tips", "Regular stretching exercises"),
+    Rule("Medium", "Wellness Tips", "Digital detox for 1 hour before bed"),
+    Rule("Medium", "Preventive Measures", "Set realistic goals and priorities"),
+    Rule("Medium", "Preventive Measures", "Create a balanced weekly schedule"),
+    Rule("Medium", "Preventive Measures", "Practice saying 'no' when necessary"),
+    Rule("Medium", "Preventive Measures", "Regular social connections"),
+
+    Rule("Low", "Maintenance Tips", "Continue your effective stress management practices"),
+    Rule("Low", "Maintenance Tips", "Regular exercise and movement"),
+    Rule("Low", "Maintenance Tips", "Maintain social connections"),
+    Rule("Low", "Maintenance Tips", "Healthy sleep schedule"),
+    Rule("Low", "Enhancement Strategies", "Set new personal growth goals"),
+    Rule("Low", "Enhancement Strategies", "Learn new skills or hobbies"),
+    Rule("Low", "Enhancement Strategies", "Share your successful strategies with others"),
+    Rule("Low", "Enhancement Strategies", "Regular wellness check-ins"),
+)
+
+ADVICE = AdviceCatalogue(RULES)
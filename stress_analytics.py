@@ -0,0 +1,149 @@
+"""Pre-aggregated stress rollups for dashboards.
+
+``RollupStore`` keeps one ``rollups`` row per (dimension, value, day): the
+number of assessments, the sum and sum of squares of their scores and the
+High/Medium/Low counts. The rows are updated in the same transaction that
+inserts each batch of assessments, so they never drift from the raw table,
+and dashboard queries read O(buckets) rollup rows instead of scanning every
+assessment. ``rebuild`` recomputes them from scratch for backfills.
+"""
+import math
+import time
+
+from stress_advice import AGE_BANDS, band
+from stress_store import BUCKETS, COLUMNS, SCHEMA_SQL, AssessmentStore
+
+POSITION = {column: i for i, column in enumerate(COLUMNS)}
+# Dashboard dimension -> its value for an assessment row; "all" gives the overall totals
+DIMENSIONS = {
+    "all": lambda row: "all",
+    "occupation": lambda row: row[POSITION["occupation"]],
+    "age_band": lambda row: band(row[POSITION["age"]], AGE_BANDS),
+    "bmi_category": lambda row: row[POSITION["bmi_category"]],
+    "sleep_disorder": lambda row: row[POSITION["sleep_disorder"]],
+}
+LEVELS = ("High", "Medium", "Low")
+# Rollups are kept per day, so they can be read by day or any coarser bucket
+ROLLUP_BUCKETS = {bucket: fmt for bucket, fmt in BUCKETS.items() if bucket != "hour"}
+REBUILD_CHUNK = 10_000
+
+ROLLUP_SQL = """
+CREATE TABLE IF NOT EXISTS rollups (
+    dimension TEXT NOT NULL,
+    value TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    score_sum REAL NOT NULL,
+    score_sumsq REAL NOT NULL,
+    high INTEGER NOT NULL,
+    medium INTEGER NOT NULL,
+    low INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value, bucket)
+) WITHOUT ROWID;
+"""
+UPSERT_SQL = """
+INSERT INTO rollups (dimension, value, bucket, count, score_sum, score_sumsq, high, medium, low)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (dimension, value, bucket) DO UPDATE SET
+    count = count + excluded.count,
+    score_sum = score_sum + excluded.score_sum,
+    score_sumsq = score_sumsq + excluded.score_sumsq,
+    high = high + excluded.high,
+    medium = medium + excluded.medium,
+    low = low + excluded.low
+"""
+
+
+def aggregate(rows):
+    """Fold assessment rows into ``{(dimension, value, day): [count, sum, sumsq, high, medium, low]}``."""
+    totals = {}
+    created_at, level, score = POSITION["created_at"], POSITION["level"], POSITION["score"]
+    for row in rows:
+        day = time.strftime("%Y-%m-%d", time.gmtime(row[created_at]))
+        points = row[score]
+        levels = [int(row[level] == name) for name in LEVELS]
+        for dimension, value_of in DIMENSIONS.items():
+            key = (dimension, value_of(row), day)
+            entry = totals.get(key)
+            if entry is None:
+                totals[key] = [1, points, points * points] + levels
+            else:
+                entry[0] += 1
+                entry[1] += points
+                entry[2] += points * points
+                for i, hit in enumerate(levels):
+                    entry[3 + i] += hit
+    return totals
+
+
+def update_rollups(connection, rows):
+    """Add ``rows`` to the rollups inside the caller's transaction."""
+    connection.executemany(UPSERT_SQL, [key + tuple(entry) for key, entry in aggregate(rows).items()])
+
+
+class RollupStore(AssessmentStore):
+    """AssessmentStore that maintains the rollups as it writes."""
+
+    schema_sql = SCHEMA_SQL + ROLLUP_SQL
+
+    def write_batch(self, connection, rows):
+        super().write_batch(connection, rows)
+        update_rollups(connection, rows)
+
+    def rebuild(self):
+        """Recompute every rollup from the stored assessments; returns the number of rows read.
+
+        Runs in one write transaction. Batches the writer commits meanwhile
+        find the database locked and are retried until the rebuild commits,
+        so none is counted twice or lost; new assessments just reach the
+        database after the rebuild finishes.
+        """
+        rows_read = 0
+        with self.reader() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                connection.execute("DELETE FROM rollups")
+                cursor = connection.execute(f"SELECT {', '.join(COLUMNS)} FROM assessments")
+                while True:
+                    rows = cursor.fetchmany(REBUILD_CHUNK)
+                    if not rows:
+                        break
+                    update_rollups(connection, [tuple(row) for row in rows])
+                    rows_read += len(rows)
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return rows_read
+
+    def rollup(self, dimension, bucket="day", since=None, until=None):
+        """Mean score, spread and level shares per dimension value and time bucket.
+
+        ``since``/``until`` are inclusive ``YYYY-MM-DD`` days. Reads only the
+        rollup rows, so the cost grows with values x buckets, not assessments.
+        """
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension {dimension!r}; choose from {', '.join(DIMENSIONS)}")
+        if bucket not in ROLLUP_BUCKETS:
+            raise ValueError(f"Unknown bucket {bucket!r}; choose from {', '.join(ROLLUP_BUCKETS)}")
+        with self.reader() as connection:
+            rows = connection.execute(
+                "SELECT value, strftime(?, bucket) AS period, SUM(count) AS count, SUM(score_sum) AS score_sum, "
+                "SUM(score_sumsq) AS score_sumsq, SUM(high) AS high, SUM(medium) AS medium, SUM(low) AS low "
+                "FROM rollups WHERE dimension = ? AND bucket BETWEEN ? AND ? "
+                "GROUP BY value, period ORDER BY period, value",
+                (ROLLUP_BUCKETS[bucket], dimension, since or "0000-00-00", until or "9999-99-99"),
+            ).fetchall()
+        results = []
+        for row in rows:
+            count = row["count"]
+            mean = row["score_sum"] / count
+            results.append({
+                "value": row["value"],
+                "bucket": row["period"],
+                "count": count,
+                "mean_score": mean,
+                "std_score": math.sqrt(max(row["score_sumsq"] / count - mean * mean, 0.0)),
+                **{f"{level.lower()}_share": row[level.lower()] / count for level in LEVELS},
+            })
+        return results
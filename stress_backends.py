@@ -0,0 +1,66 @@
+"""Registry of regression backends that can serve the stress score.
+
+Every backend is fitted on the same encoded feature matrix, so the encoder,
+cache, batch scoring and service work unchanged whichever one is loaded. Only
+the random forest ("rf") gets the flattened inference engine, deduplicated
+weighted training, incremental updates and compact artifacts.
+
+Set ``STRESS_MODEL_BACKEND`` to choose the backend the app and CLI train and
+serve; an artifact trained with a different backend is then retrained.
+"""
+import os
+from dataclasses import dataclass, field
+
+from sklearn.ensemble import HistGradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
+
+DEFAULT_BACKEND = "rf"
+# None means "serve whatever backend the artifact was trained with"
+CONFIGURED_BACKEND = os.environ.get("STRESS_MODEL_BACKEND") or None
+
+
+@dataclass
+class Backend:
+    name: str
+    description: str
+    factory: object
+    params: dict = field(default_factory=dict)
+
+    def build(self, params=None):
+        """A fresh, unfitted estimator with ``params`` (or the backend defaults)."""
+        return self.factory(**dict(self.params if params is None else params))
+
+
+def _scaled(estimator_class):
+    def factory(**params):
+        return make_pipeline(StandardScaler(), estimator_class(**params))
+    return factory
+
+
+BACKENDS = {}
+
+
+def register(backend):
+    BACKENDS[backend.name] = backend
+    return backend
+
+
+register(Backend("rf", "random forest (flattened engine)", RandomForestRegressor,
+                 {"n_estimators": 100, "random_state": 42}))
+register(Backend("hgb", "histogram gradient boosting", HistGradientBoostingRegressor,
+                 {"max_iter": 200, "random_state": 42}))
+register(Backend("ridge", "standardised ridge regression", _scaled(Ridge), {"alpha": 1.0}))
+register(Backend("knn", "standardised k-nearest neighbours", _scaled(KNeighborsRegressor),
+                 {"n_neighbors": 5, "weights": "distance"}))
+
+
+def get_backend(name=None):
+    """Look up ``name``, defaulting to the configured backend, then the random forest."""
+    name = name or CONFIGURED_BACKEND or DEFAULT_BACKEND
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown model backend {name!r}; choose from {', '.join(BACKENDS)}")
@@ -0,0 +1,134 @@
+"""Chunked batch scoring of survey CSV exports with the trained stress model.
+
+Input files use the dataset's column layout (Gender, Age, Occupation, ...,
+Blood Pressure as "120/80", Sleep Disorder). Rows are read, encoded and scored
+one chunk at a time, so memory stays bounded regardless of file size. Each
+chunk is validated against ``DATASET_SCHEMA`` column-wise; rows that fail get
+an empty score and an ``errors`` message instead of stopping the run.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from stress_data import TARGET_COLUMN, clean_dataframe
+from stress_predict import stress_levels
+from stress_schema import DATASET_SCHEMA, row_errors
+
+ID_COLUMN = 'Person ID'
+BLOOD_PRESSURE_COLUMN = 'Blood Pressure'
+BLOOD_PRESSURE_COLUMNS = ['Systolic_BP', 'Diastolic_BP']
+DEFAULT_CHUNKSIZE = 10000
+
+
+def validate_dataset(df):
+    """Clean a raw dataset-format DataFrame and validate it against ``DATASET_SCHEMA``.
+
+    Returns ``(typed, errors)`` as ``Schema.validate_frame`` does, except that
+    the two pressures split from Blood Pressure are reported against that
+    column: "is missing" when there is no reading, and a format error when
+    the reading is not like "120/80".
+    """
+    df_cleaned = clean_dataframe(df)
+    typed, errors = DATASET_SCHEMA.validate_frame(df_cleaned, columns="column")
+    if errors.empty:
+        return typed, errors
+    split = errors['field'].isin(BLOOD_PRESSURE_COLUMNS) & (errors['error'] == 'is missing')
+    if split.any():
+        rows = errors.loc[split, 'row'].drop_duplicates()
+        if BLOOD_PRESSURE_COLUMN in df.columns:
+            readings = df[BLOOD_PRESSURE_COLUMN].loc[rows].to_numpy(dtype=object)
+        else:
+            readings = np.full(len(rows), None, dtype=object)
+        reported = pd.DataFrame({
+            'row': rows.to_numpy(),
+            'field': BLOOD_PRESSURE_COLUMN,
+            'value': readings,
+            'error': np.where(pd.isna(readings), 'is missing', 'must be a reading like 120/80'),
+        })
+        errors = pd.concat([errors[~split], reported], ignore_index=True)
+    return typed, errors
+
+
+def validate_labelled(df):
+    """``validate_dataset`` for rows that also carry a Stress Level, as used to update the model.
+
+    Returns ``(typed, y, errors)``; the target must be a number from 1 to 10.
+    """
+    typed, errors = validate_dataset(df.drop(columns=[TARGET_COLUMN], errors='ignore'))
+    if TARGET_COLUMN in df.columns:
+        raw = df[TARGET_COLUMN].to_numpy(dtype=object)
+        y = pd.to_numeric(df[TARGET_COLUMN], errors='coerce').to_numpy(dtype=np.float64)
+    else:
+        raw = np.full(len(df), None, dtype=object)
+        y = np.full(len(df), np.nan)
+    with np.errstate(invalid='ignore'):
+        rejected = np.isnan(y) | (y < 1) | (y > 10)
+    if rejected.any():
+        target_errors = pd.DataFrame({
+            'row': df.index[rejected],
+            'field': TARGET_COLUMN,
+            'value': raw[rejected],
+            'error': np.where(pd.isna(raw[rejected]), 'is missing', 'must be a number between 1 and 10'),
+        })
+        errors = pd.concat([errors, target_errors], ignore_index=True)
+    return typed, y, errors
+
+
+def score_frame(df, bundle):
+    """Score a raw dataset-format DataFrame.
+
+    Returns ``(result, unknown)``: a DataFrame of scores, levels and
+    validation errors (rows with errors are not scored), and the encoder's
+    per-column masks of categories unseen in training, over all rows.
+    """
+    # A Stress Level column, if present, is carried along and ignored
+    typed, errors = validate_dataset(df)
+    valid = ~df.index.isin(errors['row'])
+    scores = np.full(len(df), np.nan)
+    levels = np.full(len(df), '', dtype=object)
+    unknown = {}
+    if valid.any():
+        X, valid_unknown = bundle.encoder.encode_frame(typed if valid.all() else typed[valid])
+        scores[valid] = bundle.predict(X)
+        levels[valid] = stress_levels(scores[valid])
+        for column, mask in valid_unknown.items():
+            unknown[column] = np.zeros(len(df), dtype=bool)
+            unknown[column][valid] = mask
+    result = pd.DataFrame({
+        'stress_score': scores,
+        'stress_level': levels,
+        'errors': row_errors(errors).reindex(df.index, fill_value='') if len(errors) else '',
+    }, index=df.index)
+    return result, unknown
+
+
+def score_csv(input_path, output_path, bundle, chunksize=DEFAULT_CHUNKSIZE):
+    """Stream ``input_path`` through the model into ``output_path``.
+
+    Returns a dict with the number of rows read, the number rejected by
+    validation, per-column counts of categories unseen in training, elapsed
+    seconds and rows/sec.
+    """
+    rows = 0
+    invalid = 0
+    unknown_counts = {}
+    start = time.perf_counter()
+    with open(output_path, 'w', newline='') as out:
+        for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+            result, unknown = score_frame(chunk, bundle)
+            if ID_COLUMN in chunk.columns:
+                result.insert(0, ID_COLUMN, chunk[ID_COLUMN])
+            result.to_csv(out, header=(i == 0), index=False, float_format='%.4f')
+            rows += len(chunk)
+            invalid += int((result['errors'] != '').sum())
+            for column, mask in unknown.items():
+                unknown_counts[column] = unknown_counts.get(column, 0) + int(np.count_nonzero(mask))
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'invalid': invalid,
+        'unknown': unknown_counts,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed > 0 else float('inf'),
+    }
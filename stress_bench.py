@@ -0,0 +1,390 @@
+"""Performance benchmarks for the app, model and batch paths.
+
+Results are written as JSON so runs can be compared over time; ``compare``
+flags any metric that is worse than a stored baseline by more than a relative
+threshold. Run through ``python stress_cli.py bench``.
+"""
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+APP_PATH = os.path.join(ROOT, "stressmanagerapp.py")
+DEFAULT_BASELINE_PATH = os.path.join(ROOT, "benchmarks", "baseline.json")
+DEFAULT_THRESHOLD = 0.25
+DEFAULT_BATCH_SIZES = (1, 100, 10_000, 1_000_000)
+DEFAULT_SESSION_COUNTS = (1000, 10_000)
+# Differences smaller than this are timer/allocator noise, whatever the ratio
+ABSOLUTE_TOLERANCE = {"ms": 0.05, "s": 0.005, "bytes": 64}
+
+SAMPLE_ANSWERS = [
+    ("gender", "Male"),
+    ("age", "30"),
+    ("occupation", "Doctor"),
+    ("sleep_duration", "7.5"),
+    ("sleep_quality", "6"),
+    ("activity_level", "5"),
+    ("bmi_category", "Normal"),
+    ("systolic_bp", "120"),
+    ("diastolic_bp", "80"),
+    ("heart_rate", "70"),
+    ("daily_steps", "8000"),
+    ("sleep_disorder", "None"),
+]
+
+
+def _metric(value, unit, better="lower"):
+    return {"value": float(value), "unit": unit, "better": better}
+
+
+def _percentiles(samples):
+    samples = np.asarray(samples)
+    return {"p50": float(np.percentile(samples, 50)), "p99": float(np.percentile(samples, 99))}
+
+
+def bench_cold_start(repeats=3):
+    """Fresh-interpreter import of the app module; the model now loads on first use."""
+    code = (
+        "import time, logging; logging.disable(logging.WARNING); t = time.perf_counter(); "
+        "import stressmanagerapp; print(time.perf_counter() - t)"
+    )
+    timings = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        timings.append(float(output.strip().splitlines()[-1]))
+    return {"cold_start_import_s": _metric(np.median(timings), "s")}
+
+
+def bench_imports(repeats=3):
+    """Fresh-interpreter import and first prediction: NumPy runtime file vs the full model stack."""
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact = os.path.join(tmp, "stress_model.joblib")
+        subprocess.run([sys.executable, "stress_cli.py", "train", "--output", artifact],
+                       cwd=ROOT, capture_output=True, check=True)
+        runtime = os.path.splitext(artifact)[0] + ".npz"
+        answers = dict(SAMPLE_ANSWERS)
+        snippets = {
+            "import_stress_predict_s": "import stress_predict",
+            "first_predict_runtime_s": f"import stress_predict; stress_predict.predict({answers!r}, path={runtime!r})",
+            "import_stress_model_s": "import stress_model",
+            "first_predict_model_s": f"import stress_model; "
+                                     f"stress_model.load_artifact({artifact!r}).predict_record({answers!r})",
+        }
+        results = {}
+        for name, snippet in snippets.items():
+            code = f"import time; t = time.perf_counter(); {snippet}; print(time.perf_counter() - t)"
+            timings = []
+            for _ in range(repeats):
+                output = subprocess.run(
+                    [sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True
+                ).stdout
+                timings.append(float(output.strip().splitlines()[-1]))
+            results[name] = _metric(np.median(timings), "s")
+    return results
+
+
+def _questionnaire_fragment():
+    """AppTest script that runs only the questionnaire fragment, as a browser's fragment rerun does."""
+    import streamlit as st
+
+    import stressmanagerapp
+    from stress_session import AssessmentAnswers
+
+    if 'step' not in st.session_state:
+        st.session_state.step = 0
+        st.session_state.user_data = AssessmentAnswers()
+    stressmanagerapp.questionnaire()
+
+
+def _time_answers(app):
+    """Seconds from each Next click until the following question is rendered."""
+    timings = []
+    for _, answer in SAMPLE_ANSWERS:
+        app.text_input[0].input(answer)
+        app.button(key="next_button").click()
+        start = time.perf_counter()
+        app.run()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def bench_reruns():
+    """Time to the next question per answer, through the whole page and through the fragment alone.
+
+    AppTest can only rerun a whole script, so the whole-page timings run the
+    page header, mode switch and footer on each of the two runs an answer
+    takes. The fragment timings run a script holding just the questionnaire
+    fragment, which is the work a browser session does per answer.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    start = time.perf_counter()
+    app.run()
+    first_run = time.perf_counter() - start
+    page_timings = _time_answers(app)
+
+    fragment = AppTest.from_function(_questionnaire_fragment, default_timeout=120)
+    fragment.run()
+    fragment_timings = _time_answers(fragment)
+
+    results = {
+        "first_run_s": _metric(first_run, "s"),
+        "next_question_mean_s": _metric(np.mean(page_timings), "s"),
+        "next_question_max_s": _metric(np.max(page_timings), "s"),
+        "fragment_rerun_mean_s": _metric(np.mean(fragment_timings), "s"),
+        "fragment_rerun_max_s": _metric(np.max(fragment_timings), "s"),
+    }
+    for i, timing in enumerate(page_timings):
+        results[f"next_question_step_{i:02d}_s"] = _metric(timing, "s")
+    return results
+
+
+def bench_predict(iterations=2000):
+    """Single-call predict_stress latency with a cold and a warm prediction cache."""
+    import logging
+    logging.disable(logging.WARNING)
+    import stressmanagerapp as app
+    from stress_cache import PREDICTION_CACHE
+
+    user_data = dict(SAMPLE_ANSWERS)
+    # main() looks the shared model up once per rerun and passes it in
+    bundle = app.current_model()
+    app.predict_stress(user_data, bundle)
+
+    cold, warm = [], []
+    for _ in range(iterations):
+        PREDICTION_CACHE.clear()
+        start = time.perf_counter()
+        app.predict_stress(user_data, bundle)
+        cold.append(time.perf_counter() - start)
+    for _ in range(iterations):
+        start = time.perf_counter()
+        app.predict_stress(user_data, bundle)
+        warm.append(time.perf_counter() - start)
+
+    cold_p, warm_p = _percentiles(cold), _percentiles(warm)
+    return {
+        "predict_uncached_p50_ms": _metric(cold_p["p50"] * 1000, "ms"),
+        "predict_uncached_p99_ms": _metric(cold_p["p99"] * 1000, "ms"),
+        "predict_cached_p50_ms": _metric(warm_p["p50"] * 1000, "ms"),
+        "predict_cached_p99_ms": _metric(warm_p["p99"] * 1000, "ms"),
+    }
+
+
+def synthetic_survey(n_rows, seed=0):
+    """``n_rows`` respondents resampled from the embedded dataset."""
+    from stress_data import load_raw_dataframe
+
+    df = load_raw_dataframe()
+    rows = np.random.default_rng(seed).integers(0, len(df), n_rows)
+    return df.iloc[rows].reset_index(drop=True)
+
+
+def bench_batch(sizes=DEFAULT_BATCH_SIZES):
+    """End-to-end clean + encode + predict throughput of batch scoring."""
+    from stress_batch import score_frame
+    from stress_model import load_or_train
+
+    bundle = load_or_train()
+    results = {}
+    for size in sizes:
+        df = synthetic_survey(size)
+        repeats = max(1, min(50, 10_000 // size))
+        start = time.perf_counter()
+        for _ in range(repeats):
+            score_frame(df, bundle)
+        elapsed = (time.perf_counter() - start) / repeats
+        results[f"batch_{size}_rows_per_s"] = _metric(size / elapsed, "rows/s", better="higher")
+    return results
+
+
+def simulate_session():
+    """The per-session state a completed questionnaire leaves behind in the app."""
+    from stress_session import AssessmentAnswers
+
+    answers = AssessmentAnswers()
+    for key, answer in SAMPLE_ANSWERS:
+        # Fresh strings, as each session receives its own widget values
+        answers.set(key, "".join(answer))
+    return {"step": len(SAMPLE_ANSWERS), "user_data": answers}
+
+
+def bench_session_memory(session_counts=DEFAULT_SESSION_COUNTS):
+    """Bytes retained per simulated session at each session count."""
+    simulate_session()
+    results = {}
+    for n_sessions in session_counts:
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        sessions = [simulate_session() for _ in range(n_sessions)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del sessions
+        results[f"session_bytes_at_{n_sessions}"] = _metric((after - before) / n_sessions, "bytes")
+    return results
+
+
+def bench_store(n_sessions=50, per_session=40, history_reads=500):
+    """Assessment store with rollups: write rate from concurrent sessions, history and rollup read latency."""
+    import threading
+
+    from stress_analytics import RollupStore
+
+    answers = simulate_session()["user_data"]
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RollupStore(os.path.join(tmp, "assessments.db"))
+
+        def session(i):
+            for _ in range(per_session):
+                store.record(f"user-{i}", answers, "High", 7.1, "bench")
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=session, args=(i,)) for i in range(n_sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        store.flush()
+        elapsed = time.perf_counter() - start
+
+        timings, rollup_timings = [], []
+        for i in range(history_reads):
+            read_start = time.perf_counter()
+            store.history(f"user-{i % n_sessions}", limit=10)
+            timings.append(time.perf_counter() - read_start)
+            read_start = time.perf_counter()
+            store.rollup("occupation", bucket="week")
+            rollup_timings.append(time.perf_counter() - read_start)
+        store.close()
+    return {
+        "store_writes_per_s": _metric(n_sessions * per_session / elapsed, "rows/s", better="higher"),
+        "store_history_p50_ms": _metric(np.percentile(timings, 50) * 1000.0, "ms"),
+        "store_rollup_p50_ms": _metric(np.percentile(rollup_timings, 50) * 1000.0, "ms"),
+    }
+
+
+def bench_backends(names=None, latency_repeats=500, batch_rows=100_000):
+    """RMSE, fit time, single-row latency and batch throughput of each model backend.
+
+    Every backend is trained on the same hold-out split of the embedded data,
+    and timed through ``ModelBundle.predict`` as ``predict_stress`` calls it.
+    """
+    from stress_backends import BACKENDS
+    from stress_data import clean_dataframe
+    from stress_model import train_model
+
+    X_batch = None
+    rows = []
+    for name in names or BACKENDS:
+        bundle = train_model(backend=name)
+        if X_batch is None:
+            X_batch, _ = bundle.encoder.encode_frame(clean_dataframe(synthetic_survey(batch_rows)))
+        single = []
+        for i in range(latency_repeats):
+            row = X_batch[i:i + 1]
+            start = time.perf_counter()
+            bundle.predict(row)
+            single.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        bundle.predict(X_batch)
+        batch_seconds = time.perf_counter() - start
+        latency = _percentiles(single)
+        rows.append({
+            "backend": name,
+            "version": bundle.version,
+            "rmse": bundle.metrics["rmse"],
+            "r2": bundle.metrics["r2"],
+            "fit_s": bundle.metrics["fit_seconds"],
+            "predict_p50_ms": latency["p50"] * 1000,
+            "predict_p99_ms": latency["p99"] * 1000,
+            "batch_rows_per_s": batch_rows / batch_seconds,
+        })
+    return rows
+
+
+def format_backends(rows):
+    header = f"{'backend':<8} {'rmse':>7} {'r2':>7} {'fit s':>7} {'p50 ms':>8} {'p99 ms':>8} {'batch rows/s':>13}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        lines.append(
+            f"{row['backend']:<8} {row['rmse']:>7.4f} {row['r2']:>7.4f} {row['fit_s']:>7.3f} "
+            f"{row['predict_p50_ms']:>8.3f} {row['predict_p99_ms']:>8.3f} {row['batch_rows_per_s']:>13,.0f}"
+        )
+    return "\n".join(lines)
+
+
+def run_all(batch_sizes=DEFAULT_BATCH_SIZES, session_counts=DEFAULT_SESSION_COUNTS, skip=()):
+    benches = [
+        ("cold_start", bench_cold_start),
+        ("imports", bench_imports),
+        ("reruns", bench_reruns),
+        ("predict", bench_predict),
+        ("batch", lambda: bench_batch(batch_sizes)),
+        ("session_memory", lambda: bench_session_memory(session_counts)),
+        ("store", bench_store),
+    ]
+    metrics = {}
+    for name, bench in benches:
+        if name not in skip:
+            metrics.update(bench())
+
+    import sklearn
+    return {
+        "meta": {
+            "timestamp": time.time(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "sklearn": sklearn.__version__,
+        },
+        "metrics": metrics,
+    }
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """Metrics more than ``threshold`` (relative) worse than ``baseline``."""
+    regressions = []
+    for name, base in baseline["metrics"].items():
+        current = results["metrics"].get(name)
+        if current is None or base["value"] == 0:
+            continue
+        if abs(current["value"] - base["value"]) < ABSOLUTE_TOLERANCE.get(base["unit"], 0):
+            continue
+        change = (current["value"] - base["value"]) / base["value"]
+        if base["better"] == "higher":
+            change = -change
+        if change > threshold:
+            regressions.append({
+                "metric": name,
+                "baseline": base["value"],
+                "current": current["value"],
+                "unit": base["unit"],
+                "worse_by": change,
+            })
+    return regressions
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write("\n")
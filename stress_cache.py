@@ -0,0 +1,77 @@
+"""Process-wide LRU cache of model predictions.
+
+Questionnaire answers are almost all discrete, so many sessions submit the same
+profile. Entries are keyed on the encoded feature vector rather than the raw
+answers, which makes "male " and "Male" share an entry, and the whole cache is
+dropped as soon as a prediction for a different model version is requested.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = int(os.environ.get("STRESS_PREDICTION_CACHE_SIZE", "4096"))
+
+
+class PredictionCache:
+    """Thread-safe bounded LRU mapping encoded rows to predicted scores."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _check_version(self, version):
+        if version != self._version:
+            self._entries.clear()
+            self._version = version
+
+    def get_or_compute(self, version, row, compute):
+        """Return the cached score for ``row`` under ``version``, else ``compute()`` it."""
+        key = row.tobytes()
+        with self._lock:
+            self._check_version(version)
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        # Compute outside the lock; a concurrent miss on the same key just repeats the work
+        value = compute()
+
+        with self._lock:
+            if version == self._version and self.maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def gauges(self):
+        """Numeric stats under Prometheus-style metric names."""
+        stats = self.stats()
+        return {f"stress_prediction_cache_{name}": stats[name]
+                for name in ("size", "maxsize", "hits", "misses", "evictions")}
+
+    def stats(self):
+        with self._lock:
+            return {
+                "version": self._version,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+PREDICTION_CACHE = PredictionCache()
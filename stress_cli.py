@@ -0,0 +1,324 @@
+"""Command line tools for the stress model.
+
+    python stress_cli.py train [--output models/stress_model.joblib] [--dedupe] [--data survey.parquet] [--compact]
+    python stress_cli.py train --backend hgb
+    python stress_cli.py backends [--report backends.json]
+    python stress_cli.py compact [--rmse-tolerance 0.05] [--output models/stress_model.joblib] [--report sizes.json]
+    python stress_cli.py update --data new_labels.csv [--add-trees 10] [--retire 10]
+    python stress_cli.py score survey.csv scores.csv [--chunksize 10000]
+    python stress_cli.py serve [--port 8000] [--max-batch-size 64] [--max-wait-ms 5]
+    python stress_cli.py evaluate [--folds 5] [--workers 4] [--report metrics.json]
+    python stress_cli.py bench [--output bench.json] [--threshold 0.25] [--update-baseline]
+    python stress_cli.py rollups [--dimension occupation] [--bucket week] [--rebuild]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+import stress_bench
+import stress_compact
+from stress_analytics import DIMENSIONS, ROLLUP_BUCKETS, RollupStore
+from stress_backends import BACKENDS, get_backend
+from stress_batch import DEFAULT_CHUNKSIZE, score_csv
+from stress_evaluate import DEFAULT_CACHE_DIR, DEFAULT_FOLDS, evaluate
+from stress_model import (
+    DEFAULT_ARTIFACT_PATH,
+    MODEL_PARAMS,
+    load_or_train,
+    load_artifact,
+    save_artifact,
+    train_from_source,
+    train_model,
+    update_model,
+)
+from stress_service import DEFAULT_MAX_BATCH_SIZE, DEFAULT_MAX_WAIT_MS, StressService
+from stress_sources import DEFAULT_CACHE_DIR as FEATURE_CACHE_DIR, DEFAULT_CHUNKSIZE as SOURCE_CHUNKSIZE
+from stress_sources import iter_source_chunks
+from stress_store import DEFAULT_STORE_PATH
+
+
+def cmd_train(args):
+    backend = get_backend(args.backend).name
+    params = None
+    if backend == "rf":
+        params = stress_compact.model_params(args.n_estimators, args.max_depth, args.min_samples_leaf,
+                                             args.random_state)
+    if args.data:
+        try:
+            bundle = train_from_source(args.data, params=params, dedupe=args.dedupe,
+                                       cache_dir=args.cache_dir, chunksize=args.chunksize, backend=backend)
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 1
+        if bundle.metrics["invalid_rows"]:
+            print(f"warning: {bundle.metrics['invalid_rows']} rows failed validation and were not trained on:",
+                  file=sys.stderr)
+            for row, message in bundle.metrics["invalid_sample"].items():
+                print(f"  row {row}: {message}", file=sys.stderr)
+    else:
+        bundle = train_model(params=params, dedupe=args.dedupe, backend=backend)
+    save_artifact(bundle, args.output, compact=args.compact)
+    print(json.dumps({
+        "artifact": args.output,
+        "version": bundle.version,
+        "backend": bundle.backend,
+        "data_hash": bundle.data_hash,
+        "params": bundle.params,
+        "metrics": bundle.metrics,
+    }, indent=2))
+    return 0
+
+
+def cmd_backends(args):
+    names = [name for name in args.backends.split(",") if name]
+    for name in names:
+        get_backend(name)
+    rows = stress_bench.bench_backends(names)
+    print(stress_bench.format_backends(rows))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(rows, f, indent=2)
+    return 0
+
+
+def parse_grid_values(text, allow_none=False):
+    return tuple(None if allow_none and value.lower() == "none" else int(value) for value in text.split(",") if value)
+
+
+def cmd_compact(args):
+    grid = {
+        "n_estimators": parse_grid_values(args.n_estimators),
+        "max_depth": parse_grid_values(args.max_depth, allow_none=True),
+        "min_samples_leaf": parse_grid_values(args.min_samples_leaf),
+    }
+    rows = stress_compact.search(grid=grid, random_state=args.random_state, dedupe=args.dedupe)
+    selected = stress_compact.select(rows, args.rmse_tolerance)
+    print(stress_compact.format_table(rows, selected))
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump({"rmse_tolerance": args.rmse_tolerance, "selected": selected, "configurations": rows}, f,
+                      indent=2)
+    if args.output:
+        bundle = train_model(params=selected["params"], dedupe=args.dedupe, backend="rf")
+        save_artifact(bundle, args.output, compact=True)
+        print(f"Wrote compact model {bundle.version} ({selected['params']}) to {args.output}", file=sys.stderr)
+    return 0
+
+
+def cmd_update(args):
+    import pandas as pd
+
+    bundle = load_artifact(args.model)
+    new_df = pd.concat(list(iter_source_chunks(args.data)), ignore_index=True)
+    try:
+        updated, unknown, invalid = update_model(bundle, new_df, add_trees=args.add_trees, retire_oldest=args.retire)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    save_artifact(updated, args.output or args.model)
+    if len(invalid):
+        print(f"warning: {len(invalid)} rows failed validation and were left out of the update:", file=sys.stderr)
+        for row, message in invalid.head(10).items():
+            print(f"  row {row}: {message}", file=sys.stderr)
+    for column, count in unknown.items():
+        print(f"warning: {count} rows had a {column} unseen in training (encoded as baseline)", file=sys.stderr)
+    print(json.dumps({
+        "artifact": args.output or args.model,
+        "version": updated.version,
+        "n_estimators": updated.params["n_estimators"],
+        "update": updated.metrics["updates"][-1],
+    }, indent=2))
+    return 0
+
+
+def cmd_score(args):
+    bundle = load_or_train(args.model)
+    stats = score_csv(args.input, args.output, bundle, chunksize=args.chunksize)
+    print(f"Scored {stats['rows']} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:.0f} rows/sec) with model {bundle.version}", file=sys.stderr)
+    if stats["invalid"]:
+        print(f"warning: {stats['invalid']} rows failed validation and were not scored "
+              f"(see the errors column)", file=sys.stderr)
+    for column, count in stats["unknown"].items():
+        print(f"warning: {count} rows had a {column} unseen in training (encoded as baseline)", file=sys.stderr)
+    return 0
+
+
+def cmd_serve(args):
+    bundle = load_or_train(args.model)
+    service = StressService(bundle, max_batch_size=args.max_batch_size, max_wait_ms=args.max_wait_ms)
+    print(f"Serving model {bundle.version} on http://{args.host}:{args.port}", file=sys.stderr)
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def cmd_evaluate(args):
+    params = dict(MODEL_PARAMS, n_estimators=args.n_estimators, random_state=args.random_state)
+    report = evaluate(params=params, n_splits=args.folds, workers=args.workers,
+                      cache_dir=None if args.no_cache else args.cache_dir, dedupe=args.dedupe)
+    text = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(text + "\n")
+    print(text)
+    return 0
+
+
+def cmd_bench(args):
+    sizes = [int(size) for size in args.batch_sizes.split(",") if size]
+    skip = [name for name in args.skip.split(",") if name]
+    session_counts = [int(count) for count in args.sessions.split(",") if count]
+    results = stress_bench.run_all(batch_sizes=sizes, session_counts=session_counts, skip=skip)
+    if args.output:
+        stress_bench.write_results(results, args.output)
+    print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.update_baseline:
+        stress_bench.write_results(results, args.baseline)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one", file=sys.stderr)
+        return 0
+
+    regressions = stress_bench.compare(results, stress_bench.load_results(args.baseline), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression['metric']}: {regression['baseline']:.4g} -> {regression['current']:.4g} "
+              f"{regression['unit']} ({regression['worse_by']:+.0%})", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+def cmd_rollups(args):
+    store = RollupStore(args.store)
+    try:
+        if args.rebuild:
+            rows = store.rebuild()
+            print(f"Rebuilt rollups from {rows} assessments in {args.store}", file=sys.stderr)
+        print(json.dumps(store.rollup(args.dimension, bucket=args.bucket, since=args.since, until=args.until),
+                         indent=2))
+    finally:
+        store.close()
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Mental Stress Manager model tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", help="fit the model and write a versioned artifact")
+    train.add_argument("--output", default=DEFAULT_ARTIFACT_PATH, help="artifact path (default: %(default)s)")
+    train.add_argument("--backend", choices=list(BACKENDS), default=None,
+                       help="model backend (default: $STRESS_MODEL_BACKEND or rf)")
+    train.add_argument("--n-estimators", type=int, default=MODEL_PARAMS["n_estimators"])
+    train.add_argument("--random-state", type=int, default=MODEL_PARAMS["random_state"])
+    train.add_argument("--max-depth", type=int, default=None, help="limit tree depth (default: unbounded)")
+    train.add_argument("--min-samples-leaf", type=int, default=1)
+    train.add_argument("--compact", action="store_true",
+                       help="store reduced-dtype node arrays instead of the sklearn forest")
+    train.add_argument("--dedupe", action="store_true",
+                       help="collapse duplicate training rows and fit with sample weights")
+    train.add_argument("--data", help="train on this CSV/Parquet export instead of the embedded dataset")
+    train.add_argument("--cache-dir", default=FEATURE_CACHE_DIR,
+                       help="memory-mapped feature cache for --data (default: %(default)s)")
+    train.add_argument("--chunksize", type=int, default=SOURCE_CHUNKSIZE,
+                       help="rows per chunk when parsing --data (default: %(default)s)")
+    train.set_defaults(func=cmd_train)
+
+    backends = subparsers.add_parser("backends", help="compare RMSE, fit time and latency of each model backend")
+    backends.add_argument("--backends", default=",".join(BACKENDS),
+                          help="comma-separated backends to compare (default: %(default)s)")
+    backends.add_argument("--report", help="also write the comparison as JSON")
+    backends.set_defaults(func=cmd_backends)
+
+    compact = subparsers.add_parser("compact", help="search forest sizes and report size, latency and RMSE")
+    compact.add_argument("--n-estimators", default=",".join(map(str, stress_compact.DEFAULT_GRID["n_estimators"])),
+                         help="comma-separated tree counts (default: %(default)s)")
+    compact.add_argument("--max-depth", default=",".join(str(depth).lower() for depth in
+                                                         stress_compact.DEFAULT_GRID["max_depth"]),
+                         help="comma-separated depth limits, 'none' for unbounded (default: %(default)s)")
+    compact.add_argument("--min-samples-leaf",
+                         default=",".join(map(str, stress_compact.DEFAULT_GRID["min_samples_leaf"])),
+                         help="comma-separated leaf sizes (default: %(default)s)")
+    compact.add_argument("--random-state", type=int, default=MODEL_PARAMS["random_state"])
+    compact.add_argument("--dedupe", action="store_true", help="fit deduplicated weighted training")
+    compact.add_argument("--rmse-tolerance", type=float, default=stress_compact.DEFAULT_RMSE_TOLERANCE,
+                         help="relative RMSE above the grid's best that is still acceptable (default: %(default)s)")
+    compact.add_argument("--output", help="refit the selected configuration and write it as a compact artifact")
+    compact.add_argument("--report", help="also write every configuration as JSON")
+    compact.set_defaults(func=cmd_compact)
+
+    update = subparsers.add_parser("update", help="grow the saved forest with trees fitted on new labelled data")
+    update.add_argument("--data", required=True, help="CSV/Parquet of new assessments including Stress Level")
+    update.add_argument("--model", default=DEFAULT_ARTIFACT_PATH, help="artifact to update (default: %(default)s)")
+    update.add_argument("--output", help="write the updated artifact here instead of replacing --model")
+    update.add_argument("--add-trees", type=int, default=10, help="trees fitted on the new data (default: %(default)s)")
+    update.add_argument("--retire", type=int, default=0, help="oldest trees to drop afterwards (default: %(default)s)")
+    update.set_defaults(func=cmd_update)
+
+    score = subparsers.add_parser("score", help="score a CSV of respondents in chunks")
+    score.add_argument("input", help="CSV in the dataset's column layout")
+    score.add_argument("output", help="CSV to write stress_score/stress_level to")
+    score.add_argument("--model", default=DEFAULT_ARTIFACT_PATH, help="artifact path (default: %(default)s)")
+    score.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE, help="rows per chunk (default: %(default)s)")
+    score.set_defaults(func=cmd_score)
+
+    evaluate_cmd = subparsers.add_parser("evaluate", help="hold-out and stratified K-fold metrics with timings")
+    evaluate_cmd.add_argument("--folds", type=int, default=DEFAULT_FOLDS)
+    evaluate_cmd.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    evaluate_cmd.add_argument("--n-estimators", type=int, default=MODEL_PARAMS["n_estimators"])
+    evaluate_cmd.add_argument("--random-state", type=int, default=MODEL_PARAMS["random_state"])
+    evaluate_cmd.add_argument("--dedupe", action="store_true", help="evaluate deduplicated weighted training")
+    evaluate_cmd.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="fitted fold cache (default: %(default)s)")
+    evaluate_cmd.add_argument("--no-cache", action="store_true", help="always refit every fold")
+    evaluate_cmd.add_argument("--report", help="also write the JSON report to this file")
+    evaluate_cmd.set_defaults(func=cmd_evaluate)
+
+    bench = subparsers.add_parser("bench", help="run the performance benchmarks and compare to a baseline")
+    bench.add_argument("--output", help="write results JSON to this file")
+    bench.add_argument("--baseline", default=stress_bench.DEFAULT_BASELINE_PATH,
+                       help="baseline results (default: %(default)s)")
+    bench.add_argument("--threshold", type=float, default=stress_bench.DEFAULT_THRESHOLD,
+                       help="relative slowdown counted as a regression (default: %(default)s)")
+    bench.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    bench.add_argument("--batch-sizes", default=",".join(str(size) for size in stress_bench.DEFAULT_BATCH_SIZES))
+    bench.add_argument("--sessions", default=",".join(str(count) for count in stress_bench.DEFAULT_SESSION_COUNTS),
+                       help="simulated session counts for the memory benchmark (default: %(default)s)")
+    bench.add_argument("--skip", default="", help="comma-separated benchmarks to skip "
+                       "(cold_start, imports, reruns, predict, batch, session_memory, store)")
+    bench.set_defaults(func=cmd_bench)
+
+    rollups = subparsers.add_parser("rollups", help="print stress rollups of the recorded assessments")
+    rollups.add_argument("--store", default=DEFAULT_STORE_PATH, help="assessment database (default: %(default)s)")
+    rollups.add_argument("--dimension", choices=list(DIMENSIONS), default="all")
+    rollups.add_argument("--bucket", choices=list(ROLLUP_BUCKETS), default="day")
+    rollups.add_argument("--since", help="first day to include (YYYY-MM-DD)")
+    rollups.add_argument("--until", help="last day to include (YYYY-MM-DD)")
+    rollups.add_argument("--rebuild", action="store_true",
+                         help="recompute the rollups from every stored assessment first (e.g. after a backfill)")
+    rollups.set_defaults(func=cmd_rollups)
+
+    serve = subparsers.add_parser("serve", help="run the HTTP/JSON prediction service")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--model", default=DEFAULT_ARTIFACT_PATH, help="artifact path (default: %(default)s)")
+    serve.add_argument("--max-batch-size", type=int, default=DEFAULT_MAX_BATCH_SIZE,
+                       help="max rows per coalesced model call (default: %(default)s)")
+    serve.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS,
+                       help="how long to wait for more requests before predicting (default: %(default)s)")
+    serve.set_defaults(func=cmd_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+"""Search for the smallest forest that stays within an accuracy budget.
+
+The default forest grows 100 unbounded trees on a dataset with few distinct
+rows. ``search`` fits a grid of ``n_estimators`` x ``max_depth`` x
+``min_samples_leaf`` on the usual hold-out split and reports, per
+configuration, the serialized size of the full and compact artifacts, the
+single-row predict latency of the compact engine and its hold-out RMSE.
+"""
+import io
+import itertools
+import time
+
+import joblib
+import numpy as np
+from sklearn.model_selection import train_test_split
+
+from stress_data import (
+    RAW_DATA,
+    clean_dataframe,
+    data_hash,
+    encode_dataframe,
+    load_raw_dataframe,
+    unique_occupations,
+)
+from stress_features import training_categories
+from stress_model import MODEL_PARAMS, SPLIT_SEED, TEST_SIZE, artifact_payload, fit_bundle, regression_metrics
+
+DEFAULT_GRID = {
+    "n_estimators": (10, 25, 50, 100),
+    "max_depth": (None, 6, 8, 10),
+    "min_samples_leaf": (1, 2, 5),
+}
+# Accept models whose RMSE is at most this much (relative) above the best in the grid
+DEFAULT_RMSE_TOLERANCE = 0.05
+LATENCY_REPEATS = 200
+
+
+def model_params(n_estimators, max_depth=None, min_samples_leaf=1, random_state=MODEL_PARAMS["random_state"]):
+    """Forest params, leaving out defaults so the standard model keeps its version hash."""
+    params = {"n_estimators": n_estimators, "random_state": random_state}
+    if max_depth is not None:
+        params["max_depth"] = max_depth
+    if min_samples_leaf != 1:
+        params["min_samples_leaf"] = min_samples_leaf
+    return params
+
+
+def serialized_size(bundle, compact=False):
+    buffer = io.BytesIO()
+    joblib.dump(artifact_payload(bundle, compact), buffer)
+    return buffer.tell()
+
+
+def single_row_ms(engine, X, repeats=LATENCY_REPEATS):
+    """Median milliseconds to score one row with ``engine``."""
+    rows = [X[i % len(X)].reshape(1, -1) for i in range(repeats)]
+    timings = []
+    for row in rows:
+        start = time.perf_counter()
+        engine.predict(row)
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings) * 1000.0)
+
+
+def search(raw_data=RAW_DATA, grid=None, random_state=MODEL_PARAMS["random_state"], dedupe=False):
+    """Fit every configuration in ``grid``; returns one report row per configuration."""
+    grid = dict(DEFAULT_GRID, **(grid or {}))
+    df_cleaned = clean_dataframe(load_raw_dataframe(raw_data))
+    X, y = encode_dataframe(df_cleaned)
+    feature_columns = list(X.columns)
+    X, y = X.to_numpy(dtype=np.float64), y.to_numpy()
+    _, X_test, _, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED)
+    categories = training_categories(df_cleaned)
+    occupations = unique_occupations(df_cleaned)
+    content_hash = data_hash(raw_data)
+
+    rows = []
+    for n_estimators, max_depth, min_samples_leaf in itertools.product(
+            grid["n_estimators"], grid["max_depth"], grid["min_samples_leaf"]):
+        params = model_params(n_estimators, max_depth, min_samples_leaf, random_state)
+        bundle = fit_bundle(X, y, feature_columns=feature_columns, categories=categories, occupations=occupations,
+                            content_hash=content_hash, params=params, dedupe=dedupe, backend="rf")
+        engine = bundle.engine.compact()
+        rows.append({
+            "n_estimators": n_estimators,
+            "max_depth": max_depth,
+            "min_samples_leaf": min_samples_leaf,
+            "params": params,
+            "nodes": engine.n_nodes,
+            "tree_depth": engine.max_depth,
+            "full_bytes": serialized_size(bundle),
+            "compact_bytes": serialized_size(bundle, compact=True),
+            "predict_ms": single_row_ms(engine, X_test),
+            "rmse": regression_metrics(y_test, engine.predict(X_test))["rmse"],
+            "fit_seconds": bundle.metrics["fit_seconds"],
+        })
+    return rows
+
+
+def select(rows, rmse_tolerance=DEFAULT_RMSE_TOLERANCE):
+    """The row with the smallest compact artifact among those within the RMSE budget."""
+    budget = min(row["rmse"] for row in rows) * (1 + rmse_tolerance)
+    return min((row for row in rows if row["rmse"] <= budget), key=lambda row: (row["compact_bytes"], row["rmse"]))
+
+
+def format_table(rows, selected=None):
+    header = f"{'trees':>5} {'depth':>5} {'leaf':>4} {'nodes':>7} {'full KB':>9} {'compact KB':>10} " \
+             f"{'predict ms':>10} {'rmse':>7}"
+    lines = [header, "-" * len(header)]
+    for row in rows:
+        depth = "none" if row["max_depth"] is None else row["max_depth"]
+        marker = "  <- selected" if row is selected else ""
+        lines.append(
+            f"{row['n_estimators']:>5} {depth:>5} {row['min_samples_leaf']:>4} {row['nodes']:>7} "
+            f"{row['full_bytes'] / 1024:>9.1f} {row['compact_bytes'] / 1024:>10.1f} "
+            f"{row['predict_ms']:>10.3f} {row['rmse']:>7.4f}{marker}"
+        )
+    return "\n".join(lines)
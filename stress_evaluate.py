@@ -0,0 +1,115 @@
+"""Cross-validation and hold-out evaluation of the stress model.
+
+Reproduces the metrics quoted in the README: a single 80/20 hold-out split and
+Stratified K-Fold averages. Folds are fitted in parallel worker processes and
+each fitted fold model is cached on disk under a hash of its training data and
+hyperparameters, so re-running an unchanged evaluation only re-times predict.
+"""
+import hashlib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import StratifiedKFold, train_test_split
+
+from stress_data import RAW_DATA, clean_dataframe, data_hash, encode_dataframe, load_raw_dataframe
+from stress_model import MODEL_PARAMS, SPLIT_SEED, TEST_SIZE, dedupe_rows, fit_weighted_forest, regression_metrics
+
+DEFAULT_FOLDS = 5
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "folds")
+
+
+def fold_key(X_train, y_train, params, dedupe):
+    """Hash identifying a fitted fold: its exact training rows plus hyperparameters."""
+    digest = hashlib.sha256(np.ascontiguousarray(X_train).tobytes())
+    digest.update(np.ascontiguousarray(y_train).tobytes())
+    digest.update(repr(sorted(params.items())).encode("utf-8"))
+    digest.update(b"dedupe" if dedupe else b"full")
+    return digest.hexdigest()
+
+
+def _fit(X_train, y_train, params, dedupe):
+    if dedupe:
+        return fit_weighted_forest(*dedupe_rows(X_train, y_train), params)
+    return RandomForestRegressor(**params).fit(X_train, y_train)
+
+
+def run_fold(task):
+    """Fit (or load) and score one fold; runs inside a worker process."""
+    name, X_train, y_train, X_test, y_test, params, dedupe, cache_dir = task
+    key = fold_key(X_train, y_train, params, dedupe)
+    cache_path = os.path.join(cache_dir, f"{key}.joblib") if cache_dir else None
+
+    cached = cache_path is not None and os.path.exists(cache_path)
+    if cached:
+        model, fit_seconds = joblib.load(cache_path)
+    else:
+        start = time.perf_counter()
+        model = _fit(X_train, y_train, params, dedupe)
+        fit_seconds = time.perf_counter() - start
+        if cache_path is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = f"{cache_path}.tmp-{os.getpid()}"
+            joblib.dump((model, fit_seconds), tmp_path)
+            os.replace(tmp_path, cache_path)
+
+    start = time.perf_counter()
+    y_pred = model.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    result = {"fold": name, "train_rows": int(len(X_train)), "test_rows": int(len(X_test))}
+    result.update(regression_metrics(y_test, y_pred))
+    result.update({
+        "fit_seconds": fit_seconds,
+        "predict_seconds": predict_seconds,
+        "predict_rows_per_sec": len(X_test) / predict_seconds if predict_seconds > 0 else float("inf"),
+        "cached_fit": cached,
+        "cache_key": key[:12],
+    })
+    return result
+
+
+def evaluate(raw_data=RAW_DATA, params=None, n_splits=DEFAULT_FOLDS, seed=SPLIT_SEED,
+             workers=None, cache_dir=DEFAULT_CACHE_DIR, dedupe=False):
+    """Run the hold-out split and stratified K-fold CV; returns a report dict.
+
+    ``workers`` caps the process pool (``None`` lets the executor decide, 1
+    runs in-process). Pass ``cache_dir=None`` to always refit.
+    """
+    params = dict(MODEL_PARAMS if params is None else params)
+    X, y = encode_dataframe(clean_dataframe(load_raw_dataframe(raw_data)))
+    X = X.to_numpy(dtype=np.float64)
+    y = y.to_numpy()
+
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED)
+    tasks = [("holdout", X_train, y_train, X_test, y_test, params, dedupe, cache_dir)]
+    # Stress Level is an integer score, so folds are stratified on it
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=seed)
+    for i, (train_idx, test_idx) in enumerate(splitter.split(X, y)):
+        tasks.append((i, X[train_idx], y[train_idx], X[test_idx], y[test_idx], params, dedupe, cache_dir))
+
+    start = time.perf_counter()
+    if workers == 1:
+        results = [run_fold(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(run_fold, tasks))
+    wall_seconds = time.perf_counter() - start
+
+    holdout, folds = results[0], results[1:]
+    metric_names = ("rmse", "mse", "mae", "r2", "fit_seconds", "predict_seconds")
+    return {
+        "data_hash": data_hash(raw_data),
+        "params": params,
+        "dedupe": dedupe,
+        "n_splits": n_splits,
+        "seed": seed,
+        "holdout": holdout,
+        "folds": folds,
+        "cv_mean": {name: float(np.mean([fold[name] for fold in folds])) for name in metric_names},
+        "cv_std": {name: float(np.std([fold[name] for fold in folds])) for name in metric_names},
+        "wall_seconds": wall_seconds,
+    }
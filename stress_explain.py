@@ -0,0 +1,76 @@
+"""Per-field contributions of each prediction from the forest's decision paths.
+
+Along a tree path, each split moves the node value from the parent's mean to
+the child's; crediting that change to the split's feature decomposes every
+tree's output exactly into a bias (the root value) plus one term per feature.
+``ForestExplainer`` adds those changes up once per node when a model loads,
+already summed over the one-hot columns of each questionnaire field, so
+explaining rows is one leaf lookup plus a mean over trees:
+
+    score == explainer.bias + explainer.contributions(X).sum(axis=1)
+"""
+import numpy as np
+
+from stress_features import COLUMN_FIELDS, FIELD_COLUMNS
+from stress_forest import DEFAULT_CHUNK_ROWS
+
+FIELDS = tuple(FIELD_COLUMNS)
+
+
+class ForestExplainer:
+    """Tree-path contributions over a FlatForest, aggregated to questionnaire fields."""
+
+    def __init__(self, engine, encoder):
+        self.engine = engine
+        self.encoder = encoder
+        self.fields = FIELDS
+
+        # Field that each encoded feature column belongs to
+        field_of_feature = np.zeros(encoder.n_features, dtype=np.intp)
+        for column, i in encoder.numeric:
+            field_of_feature[i] = FIELDS.index(COLUMN_FIELDS[column])
+        for column, lookup in encoder.categorical.items():
+            for position in lookup.values():
+                if position >= 0:
+                    field_of_feature[position] = FIELDS.index(COLUMN_FIELDS[column])
+
+        left = engine.left.astype(np.intp)
+        right = engine.right.astype(np.intp)
+        value = engine.value.astype(np.float64)
+        split_field = field_of_feature[engine.feature.astype(np.intp)]
+
+        # Running contribution from the root to every node, filled one tree level at a time
+        self.path = np.zeros((engine.n_nodes, len(FIELDS)))
+        nodes = engine.roots.astype(np.intp)
+        for _ in range(engine.max_depth):
+            nodes = nodes[left[nodes] != nodes]
+            if not len(nodes):
+                break
+            for children in (left[nodes], right[nodes]):
+                self.path[children] = self.path[nodes]
+                self.path[children, split_field[nodes]] += value[children] - value[nodes]
+            nodes = np.concatenate((left[nodes], right[nodes]))
+        self.bias = float(value[engine.roots.astype(np.intp)].mean())
+
+    @property
+    def nbytes(self):
+        return self.path.nbytes
+
+    def contributions(self, X, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Contribution of each field to each row's score, shape (n_rows, n_fields)."""
+        X = np.asarray(X)
+        out = np.empty((len(X), len(self.fields)))
+        for start in range(0, len(X), chunk_rows):
+            stop = start + chunk_rows
+            out[start:stop] = self.path[self.engine.leaves(X[start:stop])].mean(axis=1)
+        return out
+
+    def explain_record(self, user_data):
+        """``{field: contribution}`` for one questionnaire answer dict."""
+        row, _ = self.encoder.encode_record(user_data)
+        return dict(zip(self.fields, self.contributions(row.reshape(1, -1))[0].tolist()))
+
+    def top_drivers(self, user_data, n=3):
+        """The ``n`` fields that moved this score the most, as ``(field, contribution)`` pairs."""
+        contributions = self.explain_record(user_data)
+        return sorted(contributions.items(), key=lambda item: abs(item[1]), reverse=True)[:n]
@@ -0,0 +1,126 @@
+"""Precompiled feature encoder matching the training one-hot encoding.
+
+``pd.get_dummies(drop_first=True)`` drops the first (alphabetical) category of
+each field, so a baseline category legitimately encodes as all zeros. Values
+that never appeared in training also end up all zeros, which is why the
+encoder reports them instead of hiding them.
+
+Only NumPy is imported at module level, so the record path stays usable from
+the import-light ``stress_predict``; pandas is loaded on the first frame.
+"""
+import numpy as np
+
+from stress_metrics import timed
+
+CATEGORICAL_COLUMNS = ['Gender', 'Occupation', 'BMI Category', 'Sleep Disorder']
+
+# Questionnaire keys (st.session_state.user_data) -> dataset columns
+FIELD_COLUMNS = {
+    'gender': 'Gender',
+    'age': 'Age',
+    'occupation': 'Occupation',
+    'sleep_duration': 'Sleep Duration',
+    'sleep_quality': 'Quality of Sleep',
+    'activity_level': 'Physical Activity Level',
+    'bmi_category': 'BMI Category',
+    'systolic_bp': 'Systolic_BP',
+    'diastolic_bp': 'Diastolic_BP',
+    'heart_rate': 'Heart Rate',
+    'daily_steps': 'Daily Steps',
+    'sleep_disorder': 'Sleep Disorder',
+}
+COLUMN_FIELDS = {column: key for key, column in FIELD_COLUMNS.items()}
+
+
+def normalize_category(value):
+    return str(value).strip().title()
+
+
+def training_categories(df_cleaned):
+    """Every category seen per categorical column, including dropped baselines."""
+    return {column: sorted(df_cleaned[column].astype(str).unique()) for column in CATEGORICAL_COLUMNS}
+
+
+class FeatureEncoder:
+    """Encodes questionnaire records or dataset frames onto ``feature_columns``.
+
+    Column positions are resolved once at construction; encoding then writes
+    straight into a preallocated float64 row or matrix.
+    """
+
+    def __init__(self, feature_columns, categories):
+        self.feature_columns = list(feature_columns)
+        self.n_features = len(self.feature_columns)
+        index = {column: i for i, column in enumerate(self.feature_columns)}
+
+        prefixes = tuple(f"{column}_" for column in CATEGORICAL_COLUMNS)
+        self.numeric = [(column, i) for column, i in index.items() if not column.startswith(prefixes)]
+
+        # category -> feature index, or -1 for the baseline category
+        self.categorical = {}
+        self._categories = {}
+        self._category_index = {}
+        self._indexes = None
+        for column in CATEGORICAL_COLUMNS:
+            known = list(categories[column])
+            positions = [index.get(f"{column}_{category}", -1) for category in known]
+            self.categorical[column] = dict(zip(known, positions))
+            self._categories[column] = known
+            # trailing -1 catches the code pandas assigns to unknown values
+            self._category_index[column] = np.array(positions + [-1], dtype=np.intp)
+
+    @classmethod
+    def from_training(cls, df_cleaned, feature_columns):
+        return cls(feature_columns, training_categories(df_cleaned))
+
+    @timed("encode")
+    def encode_record(self, user_data, out=None):
+        """Encode one questionnaire answer dict.
+
+        Returns ``(row, unknown)`` where ``unknown`` maps column name to any
+        normalised category value the training data never contained.
+        """
+        if out is None:
+            out = np.zeros(self.n_features)
+        else:
+            out.fill(0.0)
+        for column, i in self.numeric:
+            out[i] = float(user_data[COLUMN_FIELDS[column]])
+
+        unknown = {}
+        for column, lookup in self.categorical.items():
+            value = normalize_category(user_data[COLUMN_FIELDS[column]])
+            position = lookup.get(value)
+            if position is None:
+                unknown[column] = value
+            elif position >= 0:
+                out[position] = 1.0
+        return out, unknown
+
+    @timed("encode_batch")
+    def encode_frame(self, df_cleaned):
+        """Encode a cleaned dataset-format DataFrame in one vectorised pass.
+
+        Returns ``(X, unknown)`` where ``unknown`` maps column name to a boolean
+        row mask of values the training data never contained.
+        """
+        if self._indexes is None:
+            import pandas as pd
+            self._indexes = {column: pd.Index(known) for column, known in self._categories.items()}
+        n_rows = len(df_cleaned)
+        X = np.zeros((n_rows, self.n_features))
+        for column, i in self.numeric:
+            X[:, i] = df_cleaned[column].to_numpy(dtype=np.float64)
+
+        rows = np.arange(n_rows)
+        unknown = {}
+        for column in CATEGORICAL_COLUMNS:
+            values = df_cleaned[column].astype(str).str.strip().str.title()
+            codes = self._indexes[column].get_indexer(values)
+            positions = self._category_index[column][codes]
+            hit = positions >= 0
+            X[rows[hit], positions[hit]] = 1.0
+            missing = codes == -1
+            if missing.any():
+                unknown[column] = missing
+        return X, unknown
@@ -0,0 +1,112 @@
+"""Flattened-array inference for fitted scikit-learn forests.
+
+``RandomForestRegressor.predict`` validates its input and dispatches one job
+per tree, which dominates the cost of scoring a single questionnaire. Here
+every tree is exported once into shared contiguous node arrays, and all trees
+are walked together with vectorised NumPy steps, one tree level at a time.
+"""
+import numpy as np
+
+# Rows traversed per step of a batch; bounds the (rows x trees) work arrays
+DEFAULT_CHUNK_ROWS = 1024
+
+
+class FlatForest:
+    """All trees of a forest stored as parallel per-node arrays.
+
+    Leaves point to themselves on both sides, so a fixed ``max_depth`` number
+    of steps lands every row on its leaf without per-row branching.
+    """
+
+    def __init__(self, feature, threshold, left, right, value, roots, max_depth):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.value = value
+        self.roots = roots
+        self.max_depth = max_depth
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    @property
+    def nbytes(self):
+        arrays = (self.feature, self.threshold, self.left, self.right, self.value, self.roots)
+        return sum(array.nbytes for array in arrays)
+
+    @classmethod
+    def from_sklearn(cls, forest):
+        """Export the fitted ``estimators_`` of a sklearn forest regressor."""
+        trees = [estimator.tree_ for estimator in forest.estimators_]
+        sizes = np.array([tree.node_count for tree in trees])
+        offsets = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        feature, threshold, left, right, value = [], [], [], [], []
+        for tree, offset in zip(trees, offsets):
+            own = np.arange(tree.node_count) + offset
+            is_leaf = tree.children_left == -1
+            feature.append(np.where(is_leaf, 0, tree.feature))
+            threshold.append(tree.threshold)
+            left.append(np.where(is_leaf, own, tree.children_left + offset))
+            right.append(np.where(is_leaf, own, tree.children_right + offset))
+            value.append(tree.value[:, 0, 0])
+
+        return cls(
+            feature=np.concatenate(feature).astype(np.intp),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            left=np.concatenate(left).astype(np.intp),
+            right=np.concatenate(right).astype(np.intp),
+            value=np.concatenate(value).astype(np.float64),
+            roots=offsets.astype(np.intp),
+            max_depth=max(tree.max_depth for tree in trees),
+        )
+
+    def compact(self):
+        """A copy using the smallest dtypes that hold this forest's node arrays.
+
+        Thresholds are rounded down to float32, which keeps every split
+        decision identical for the float32 inputs sklearn compares against.
+        Leaf values become float32, so scores differ only in float32 rounding.
+        """
+        threshold = self.threshold.astype(np.float32)
+        rounded_up = threshold.astype(np.float64) > self.threshold
+        threshold[rounded_up] = np.nextafter(threshold[rounded_up], np.float32(-np.inf))
+        index_dtype = np.min_scalar_type(max(self.n_nodes - 1, 0))
+        return FlatForest(
+            feature=self.feature.astype(np.min_scalar_type(int(self.feature.max(initial=0)))),
+            threshold=threshold,
+            left=self.left.astype(index_dtype),
+            right=self.right.astype(index_dtype),
+            value=self.value.astype(np.float32),
+            roots=self.roots.astype(index_dtype),
+            max_depth=self.max_depth,
+        )
+
+    def leaves(self, X):
+        """Leaf node index reached in every tree, shape (n_rows, n_trees)."""
+        # sklearn compares float32 inputs against float64 thresholds
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        flat_X = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        node = np.broadcast_to(self.roots.astype(np.intp), (len(X), self.n_trees)).copy()
+        for _ in range(self.max_depth):
+            go_left = flat_X[row_offsets + self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return node
+
+    def predict(self, X, chunk_rows=DEFAULT_CHUNK_ROWS):
+        """Mean leaf value across trees for each row of the 2-D array ``X``."""
+        X = np.asarray(X)
+        if len(X) <= chunk_rows:
+            return self.value[self.leaves(X)].mean(axis=1, dtype=np.float64)
+        out = np.empty(len(X))
+        for start in range(0, len(X), chunk_rows):
+            stop = start + chunk_rows
+            out[start:stop] = self.value[self.leaves(X[start:stop])].mean(axis=1, dtype=np.float64)
+        return out
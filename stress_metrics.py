@@ -0,0 +1,145 @@
+"""Per-stage timing histograms and counters with a Prometheus text export.
+
+Instrumentation is off unless ``STRESS_METRICS=1`` is set (or ``enable()`` is
+called). While disabled, ``timer()`` hands back one shared no-op context
+manager, so instrumented hot paths pay only a function call and a flag check.
+
+    with stress_metrics.timer("predict"):
+        ...
+"""
+import bisect
+import contextlib
+import functools
+import os
+import threading
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_enabled = os.environ.get("STRESS_METRICS", "").lower() in ("1", "true", "yes")
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_NULL_TIMER = contextlib.nullcontext()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = bool(flag)
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+class Histogram:
+    """Bucketed latency distribution for one stage."""
+
+    __slots__ = ("counts", "total", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.total += seconds
+        self.count += 1
+
+
+def observe(stage, seconds):
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = Histogram()
+        histogram.observe(seconds)
+
+
+def count(event, amount=1):
+    if not _enabled:
+        return
+    with _lock:
+        _counters[event] = _counters.get(event, 0) + amount
+
+
+class _Timer:
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.stage, time.perf_counter() - self.start)
+        return False
+
+
+def timer(stage):
+    """Context manager recording the duration of ``stage`` when metrics are enabled."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(stage)
+
+
+def timed(stage):
+    """Decorator form of :func:`timer`."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Timer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """Per-stage count/sum/mean and counters as plain dicts, for display."""
+    with _lock:
+        stages = {
+            stage: {
+                "count": histogram.count,
+                "total_s": histogram.total,
+                "mean_ms": 1000 * histogram.total / histogram.count if histogram.count else 0.0,
+            }
+            for stage, histogram in sorted(_histograms.items())
+        }
+        return {"stages": stages, "counters": dict(sorted(_counters.items()))}
+
+
+def export_prometheus(gauges=None):
+    """Prometheus text exposition of all histograms, counters and optional ``gauges``."""
+    lines = []
+    with _lock:
+        if _histograms:
+            lines.append("# HELP stress_stage_seconds Time spent per processing stage.")
+            lines.append("# TYPE stress_stage_seconds histogram")
+        for stage, histogram in sorted(_histograms.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(BUCKETS + (float("inf"),), histogram.counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'stress_stage_seconds_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'stress_stage_seconds_sum{{stage="{stage}"}} {histogram.total!r}')
+            lines.append(f'stress_stage_seconds_count{{stage="{stage}"}} {histogram.count}')
+        if _counters:
+            lines.append("# HELP stress_events_total Counted events.")
+            lines.append("# TYPE stress_events_total counter")
+        for event, value in sorted(_counters.items()):
+            lines.append(f'stress_events_total{{event="{event}"}} {value}')
+    for name, value in sorted((gauges or {}).items()):
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {value}")
+    return "\n".join(lines) + "\n"
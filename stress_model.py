@@ -0,0 +1,398 @@
+"""Training, versioned on-disk artifacts and loading of the stress prediction model."""
+import copy
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+from sklearn.model_selection import train_test_split
+
+import stress_metrics
+
+from stress_backends import BACKENDS, CONFIGURED_BACKEND, DEFAULT_BACKEND, get_backend
+from stress_batch import validate_labelled
+from stress_cache import PREDICTION_CACHE
+from stress_data import (
+    RAW_DATA,
+    clean_dataframe,
+    data_hash,
+    encode_dataframe,
+    load_raw_dataframe,
+    unique_occupations,
+)
+from stress_features import FeatureEncoder, training_categories
+from stress_explain import ForestExplainer
+from stress_forest import FlatForest
+from stress_predict import runtime_path, save_runtime
+from stress_schema import row_errors
+
+# Bump whenever the artifact layout changes so stale files are retrained, not misread
+ARTIFACT_FORMAT = 3
+
+MODEL_PARAMS = dict(BACKENDS[DEFAULT_BACKEND].params)
+TEST_SIZE = 0.2
+# Above roughly this many rows sklearn's threaded predict beats FlatForest
+ENGINE_MAX_ROWS = 1000
+SPLIT_SEED = 42
+
+DEFAULT_ARTIFACT_PATH = os.environ.get(
+    "STRESS_MODEL_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "stress_model.joblib"),
+)
+
+
+@dataclass
+class ModelBundle:
+    """A fitted model together with everything needed to encode inputs for it."""
+    model: object
+    feature_columns: list
+    unique_occupations: list
+    categories: dict
+    data_hash: str
+    params: dict
+    version: str
+    metrics: dict = field(default_factory=dict)
+    trained_at: float = 0.0
+    backend: str = DEFAULT_BACKEND
+    encoder: FeatureEncoder = field(default=None, repr=False, compare=False)
+    engine: FlatForest = field(default=None, repr=False, compare=False)
+    explainer: ForestExplainer = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.encoder is None:
+            self.encoder = FeatureEncoder(self.feature_columns, self.categories)
+        if self.engine is None and self.backend == "rf":
+            self.engine = FlatForest.from_sklearn(self.model)
+        if self.explainer is None and self.engine is not None:
+            self.explainer = ForestExplainer(self.engine, self.encoder)
+
+    def predict(self, X):
+        """Predict scores for a 2-D array already encoded by ``self.encoder``.
+
+        Small inputs to a forest go through the flattened engine, which avoids
+        sklearn's per-call overhead; large batches use sklearn's multi-threaded
+        path. Compact bundles carry no sklearn model and always use the engine;
+        other backends always use their own estimator.
+        """
+        with stress_metrics.timer("model_predict"):
+            if self.engine is not None and (self.model is None or len(X) < ENGINE_MAX_ROWS):
+                return self.engine.predict(X)
+            return self.model.predict(X)
+
+    def predict_record(self, user_data, cache=PREDICTION_CACHE):
+        """Score one questionnaire answer dict through the shared prediction cache.
+
+        Returns ``(score, unknown)`` where ``unknown`` is the encoder's report
+        of categories unseen in training.
+        """
+        row, unknown = self.encoder.encode_record(user_data)
+        score = cache.get_or_compute(self.version, row, lambda: float(self.predict(row.reshape(1, -1))[0]))
+        return score, unknown
+
+
+def model_version(content_hash, params, dedupe=False, backend=DEFAULT_BACKEND):
+    """Short, deterministic identifier for a (dataset, backend, hyperparameters) triple."""
+    digest = hashlib.sha256(content_hash.encode("utf-8"))
+    digest.update(repr(sorted(params.items())).encode("utf-8"))
+    if dedupe:
+        digest.update(b"dedupe")
+    if backend != DEFAULT_BACKEND:
+        digest.update(backend.encode("utf-8"))
+    return digest.hexdigest()[:12]
+
+
+def dedupe_rows(X, y):
+    """Collapse identical (features, label) rows.
+
+    Returns ``(X_unique, y_unique, counts)``; fitting on the unique rows with
+    ``sample_weight=counts`` weighs each distinct profile by how often it occurs.
+    """
+    rows = np.column_stack([X, y])
+    unique, counts = np.unique(rows, axis=0, return_counts=True)
+    return unique[:, :-1], unique[:, -1], counts
+
+
+def fit_weighted_forest(X, y, counts, params):
+    """Fit a random forest on distinct rows that stand for ``counts`` duplicates each.
+
+    sklearn's bootstrap would draw uniformly over the distinct rows, dropping a
+    whole group of identical records from a tree at a time. Instead each tree's
+    bootstrap is drawn as multinomial counts over the groups, which has the same
+    distribution as bootstrapping the full duplicated data.
+    """
+    params = dict(params)
+    n_estimators = params.pop("n_estimators", 100)
+    bootstrap = params.pop("bootstrap", True)
+
+    # A one-tree fit sets up the fitted forest attributes and a tree template
+    forest = RandomForestRegressor(**dict(params, n_estimators=1, bootstrap=False))
+    forest.fit(X, y, sample_weight=counts)
+    template = forest.estimators_[0]
+
+    rng = np.random.RandomState(params.get("random_state"))
+    n_rows = counts.sum()
+    probabilities = counts / n_rows
+    trees = []
+    for _ in range(n_estimators):
+        tree = clone(template).set_params(random_state=rng.randint(np.iinfo(np.int32).max))
+        weights = rng.multinomial(n_rows, probabilities) if bootstrap else counts
+        trees.append(tree.fit(X, y, sample_weight=weights))
+
+    forest.estimators_ = trees
+    forest.set_params(n_estimators=n_estimators, bootstrap=bootstrap)
+    return forest
+
+
+def regression_metrics(y_true, y_pred):
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "rmse": float(np.sqrt(mse)),
+        "mse": float(mse),
+        "mae": float(mean_absolute_error(y_true, y_pred)),
+        "r2": float(r2_score(y_true, y_pred)),
+    }
+
+
+def fit_bundle(X, y, feature_columns, categories, occupations, content_hash, params=None, dedupe=False,
+               backend=None):
+    """Hold out a test split of the encoded ``X``/``y``, fit the backend and wrap it in a ModelBundle.
+
+    With ``dedupe`` the training split is collapsed to distinct rows fitted
+    with sample weights, so fit cost follows distinct profiles, not row count.
+    """
+    backend = get_backend(backend)
+    if dedupe and backend.name != "rf":
+        raise ValueError(f"dedupe is only supported by the rf backend, not {backend.name!r}")
+    params = dict(backend.params if params is None else params)
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=SPLIT_SEED)
+
+    start = time.perf_counter()
+    with stress_metrics.timer("model_fit"):
+        if dedupe:
+            fit_rows, fit_targets, counts = dedupe_rows(X_train, y_train)
+            model = fit_weighted_forest(fit_rows, fit_targets, counts, params)
+        else:
+            model = backend.build(params)
+            model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    metrics = regression_metrics(y_test, model.predict(X_test))
+    metrics.update({
+        "train_rows": int(len(X_train)),
+        "test_rows": int(len(X_test)),
+        "fit_seconds": fit_seconds,
+    })
+    if dedupe:
+        metrics.update({
+            "unique_train_rows": int(len(fit_rows)),
+            "compression_ratio": len(X_train) / len(fit_rows),
+        })
+
+    return ModelBundle(
+        model=model,
+        feature_columns=list(feature_columns),
+        unique_occupations=list(occupations),
+        categories=categories,
+        data_hash=content_hash,
+        params=params,
+        version=model_version(content_hash, params, dedupe, backend.name),
+        metrics=metrics,
+        trained_at=time.time(),
+        backend=backend.name,
+    )
+
+
+def train_model(raw_data=RAW_DATA, params=None, dedupe=False, backend=None):
+    """Clean, encode and fit the model on the CSV text ``raw_data``; returns a ModelBundle."""
+    df_cleaned = clean_dataframe(load_raw_dataframe(raw_data))
+    X, y = encode_dataframe(df_cleaned)
+    # Fit on plain arrays; serving encodes straight into NumPy via FeatureEncoder
+    return fit_bundle(
+        X.to_numpy(dtype=np.float64), y.to_numpy(), X.columns, training_categories(df_cleaned),
+        unique_occupations(df_cleaned), data_hash(raw_data), params, dedupe, backend,
+    )
+
+
+def train_from_source(path, params=None, dedupe=False, cache_dir=None, chunksize=None, backend=None):
+    """Fit on an external CSV/Parquet export via the memory-mapped feature cache.
+
+    Rows that fail validation are not trained on; ``metrics`` records how
+    many there were and the errors of the first few.
+    """
+    from stress_sources import DEFAULT_CACHE_DIR, DEFAULT_CHUNKSIZE, load_feature_cache
+
+    cache = load_feature_cache(path, cache_dir or DEFAULT_CACHE_DIR, chunksize or DEFAULT_CHUNKSIZE)
+    occupations = cache.categories["Occupation"] + ["Others"]
+    bundle = fit_bundle(cache.X, cache.y, cache.feature_columns, cache.categories, occupations,
+                        cache.data_hash, params, dedupe, backend)
+    bundle.metrics.update({"invalid_rows": cache.invalid_rows, "invalid_sample": cache.invalid_sample})
+    return bundle
+
+
+def update_model(bundle, new_df, add_trees=10, retire_oldest=0):
+    """Grow ``bundle``'s forest with trees fitted on newly labelled assessments.
+
+    ``new_df`` is in the dataset's raw column layout, including Stress Level.
+    The forest is extended with ``add_trees`` trees through ``warm_start`` and
+    then the ``retire_oldest`` oldest trees are dropped. Existing trees are
+    shared, not refitted, and the live bundle is left untouched. ``unknown``
+    counts, per column, rows whose category the model has never seen.
+
+    Rows that fail ``validate_labelled`` are left out of the fit; the
+    returned ``invalid`` maps their row labels to the error messages.
+    Returns ``(new_bundle, unknown, invalid)``.
+    """
+    if bundle.backend != "rf":
+        raise ValueError(f"incremental updates need the rf backend, not {bundle.backend!r}")
+    if bundle.model is None:
+        raise ValueError("compact artifacts keep only the flattened forest; retrain instead of updating")
+    typed, y, errors = validate_labelled(new_df)
+    invalid = row_errors(errors)
+    valid = ~new_df.index.isin(errors['row'])
+    if not valid.any():
+        raise ValueError(f"none of the {len(new_df)} new rows are valid "
+                         f"(row {invalid.index[0]}: {invalid.iloc[0]})")
+    X_new, unknown = bundle.encoder.encode_frame(typed if valid.all() else typed[valid])
+    y_new = y[valid]
+    pre_update = regression_metrics(y_new, bundle.predict(X_new))
+
+    forest = copy.copy(bundle.model)
+    forest.estimators_ = list(bundle.model.estimators_)
+    forest.set_params(warm_start=True, n_estimators=len(forest.estimators_) + add_trees)
+    with stress_metrics.timer("model_update"):
+        forest.fit(X_new, y_new)
+    if retire_oldest:
+        if retire_oldest >= len(forest.estimators_):
+            raise ValueError(f"cannot retire {retire_oldest} of {len(forest.estimators_)} trees")
+        forest.estimators_ = forest.estimators_[retire_oldest:]
+    forest.set_params(warm_start=False, n_estimators=len(forest.estimators_))
+
+    new_hash = hashlib.sha256(pd.util.hash_pandas_object(new_df, index=False).values.tobytes()).hexdigest()
+    digest = hashlib.sha256(f"{bundle.version}:{new_hash}:{add_trees}:{retire_oldest}".encode("utf-8"))
+    update = {
+        "previous_version": bundle.version,
+        "data_hash": new_hash,
+        "rows": int(valid.sum()),
+        "invalid_rows": int(len(invalid)),
+        "added_trees": add_trees,
+        "retired_trees": retire_oldest,
+        "unknown_categories": {column: int(mask.sum()) for column, mask in unknown.items()},
+        "pre_update_rmse": pre_update["rmse"],
+        "updated_at": time.time(),
+    }
+    metrics = dict(bundle.metrics)
+    metrics["updates"] = list(bundle.metrics.get("updates", [])) + [update]
+
+    updated = ModelBundle(
+        model=forest,
+        feature_columns=bundle.feature_columns,
+        unique_occupations=bundle.unique_occupations,
+        categories=bundle.categories,
+        data_hash=hashlib.sha256(f"{bundle.data_hash}:{new_hash}".encode("utf-8")).hexdigest(),
+        params=dict(bundle.params, n_estimators=len(forest.estimators_)),
+        version=digest.hexdigest()[:12],
+        metrics=metrics,
+        trained_at=time.time(),
+        encoder=bundle.encoder,
+    )
+    update["post_update_rmse"] = regression_metrics(y_new, updated.predict(X_new))["rmse"]
+    return updated, update["unknown_categories"], invalid
+
+
+def artifact_payload(bundle, compact=False):
+    """What ``save_artifact`` writes; ``compact`` swaps the sklearn forest for reduced-dtype node arrays."""
+    compact = compact or bundle.model is None
+    if compact and bundle.engine is None:
+        raise ValueError(f"compact artifacts need the rf backend, not {bundle.backend!r}")
+    return {
+        "format": ARTIFACT_FORMAT,
+        "model": None if compact else bundle.model,
+        "engine": bundle.engine.compact() if compact else None,
+        "feature_columns": list(bundle.feature_columns),
+        "unique_occupations": list(bundle.unique_occupations),
+        "categories": bundle.categories,
+        "data_hash": bundle.data_hash,
+        "params": bundle.params,
+        "version": bundle.version,
+        "metrics": bundle.metrics,
+        "trained_at": bundle.trained_at,
+        "backend": bundle.backend,
+    }
+
+
+def save_artifact(bundle, path=DEFAULT_ARTIFACT_PATH, compact=False):
+    """Write ``bundle`` to ``path``; readers never observe a partially written file.
+
+    Forest models also get the NumPy runtime file read by ``stress_predict``;
+    for other backends any stale runtime file is removed.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    joblib.dump(artifact_payload(bundle, compact), tmp_path)
+    os.replace(tmp_path, path)
+    if bundle.engine is not None:
+        save_runtime(runtime_path(path), bundle.engine, bundle.feature_columns, bundle.categories,
+                     bundle.unique_occupations, bundle.version)
+    else:
+        try:
+            os.remove(runtime_path(path))
+        except FileNotFoundError:
+            pass
+    return path
+
+
+def load_artifact(path=DEFAULT_ARTIFACT_PATH):
+    with stress_metrics.timer("model_load"):
+        payload = joblib.load(path)
+    if payload.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported model artifact format {payload.get('format')!r} in {path}")
+    return ModelBundle(
+        model=payload["model"],
+        feature_columns=payload["feature_columns"],
+        unique_occupations=payload["unique_occupations"],
+        categories=payload["categories"],
+        data_hash=payload["data_hash"],
+        params=payload["params"],
+        version=payload["version"],
+        metrics=payload["metrics"],
+        trained_at=payload["trained_at"],
+        backend=payload.get("backend", DEFAULT_BACKEND),
+        engine=payload["engine"],
+    )
+
+
+def artifact_stamp(path=DEFAULT_ARTIFACT_PATH):
+    """Cache key that changes whenever the artifact at ``path`` is replaced.
+
+    Without an artifact the key is the version the fallback training would produce.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        backend = get_backend()
+        return model_version(data_hash(), backend.params, backend=backend.name)
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+def load_or_train(path=DEFAULT_ARTIFACT_PATH):
+    """Serving entry point: load the saved artifact, training in memory only if none exists.
+
+    The artifact is also retrained in memory when ``STRESS_MODEL_BACKEND``
+    asks for a different backend than it was trained with.
+    """
+    if os.path.exists(path):
+        try:
+            bundle = load_artifact(path)
+        except ValueError:
+            pass
+        else:
+            if CONFIGURED_BACKEND in (None, bundle.backend):
+                return bundle
+    return train_model()
@@ -0,0 +1,127 @@
+"""Import-light prediction from the NumPy runtime artifact.
+
+Saving a forest model also writes ``<artifact>.npz`` next to the joblib file:
+the flattened node arrays in compact dtypes plus the encoder metadata as JSON.
+This module imports only NumPy and the small stress_* helpers and loads that
+file on first use, so batch jobs and other libraries can score answers
+without importing pandas, scikit-learn or Streamlit.
+
+    from stress_predict import predict
+    score, level, unknown = predict({"gender": "Male", "age": 30, ...})
+"""
+import json
+import os
+import threading
+
+import numpy as np
+
+from stress_cache import PREDICTION_CACHE
+from stress_features import FeatureEncoder
+from stress_forest import FlatForest
+from stress_schema import QUESTIONNAIRE_SCHEMA
+
+# Bump whenever the runtime file layout changes
+RUNTIME_FORMAT = 1
+FOREST_ARRAYS = ("feature", "threshold", "left", "right", "value", "roots")
+
+DEFAULT_RUNTIME_PATH = os.environ.get(
+    "STRESS_RUNTIME_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "stress_model.npz"),
+)
+
+
+def stress_level(score):
+    """Map a predicted score onto the High/Medium/Low bands shown to users."""
+    if score > 7:
+        return "High"
+    elif score > 4:
+        return "Medium"
+    else:
+        return "Low"
+
+
+def stress_levels(scores):
+    """Vectorised :func:`stress_level` for an array of scores."""
+    scores = np.asarray(scores)
+    return np.where(scores > 7, "High", np.where(scores > 4, "Medium", "Low"))
+
+
+def runtime_path(artifact_path):
+    """The runtime file written alongside the joblib artifact at ``artifact_path``."""
+    return os.path.splitext(artifact_path)[0] + ".npz"
+
+
+def save_runtime(path, engine, feature_columns, categories, unique_occupations, version):
+    """Write a compacted ``engine`` and its encoder metadata; readers never see a partial file."""
+    engine = engine.compact()
+    meta = {
+        "format": RUNTIME_FORMAT,
+        "version": version,
+        "max_depth": int(engine.max_depth),
+        "feature_columns": list(feature_columns),
+        "categories": categories,
+        "unique_occupations": list(unique_occupations),
+    }
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        np.savez(f, meta=np.array(json.dumps(meta)), **{name: getattr(engine, name) for name in FOREST_ARRAYS})
+    os.replace(tmp_path, path)
+    return path
+
+
+class Predictor:
+    """Encoder plus flattened forest loaded from a runtime file."""
+
+    def __init__(self, engine, encoder, version, unique_occupations):
+        self.engine = engine
+        self.encoder = encoder
+        self.version = version
+        self.unique_occupations = unique_occupations
+
+    @classmethod
+    def load(cls, path=DEFAULT_RUNTIME_PATH):
+        with np.load(path) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format") != RUNTIME_FORMAT:
+                raise ValueError(f"Unsupported runtime format {meta.get('format')!r} in {path}")
+            engine = FlatForest(max_depth=meta["max_depth"], **{name: data[name] for name in FOREST_ARRAYS})
+        encoder = FeatureEncoder(meta["feature_columns"], meta["categories"])
+        return cls(engine, encoder, meta["version"], meta["unique_occupations"])
+
+    def predict(self, X):
+        """Scores for a 2-D array already encoded by ``self.encoder``."""
+        return self.engine.predict(X)
+
+    def predict_record(self, user_data, cache=PREDICTION_CACHE):
+        """Same contract as ``ModelBundle.predict_record``: ``(score, unknown)``."""
+        row, unknown = self.encoder.encode_record(user_data)
+        score = cache.get_or_compute(self.version, row, lambda: float(self.engine.predict(row.reshape(1, -1))[0]))
+        return score, unknown
+
+
+_predictors = {}
+_lock = threading.Lock()
+
+
+def get_predictor(path=DEFAULT_RUNTIME_PATH):
+    """The process-wide Predictor for ``path``, loaded on first use."""
+    predictor = _predictors.get(path)
+    if predictor is None:
+        with _lock:
+            predictor = _predictors.get(path)
+            if predictor is None:
+                predictor = _predictors[path] = Predictor.load(path)
+    return predictor
+
+
+def predict(user_data, path=DEFAULT_RUNTIME_PATH):
+    """Score one answer dict; returns ``(score, level, unknown)``.
+
+    The answers are validated against ``QUESTIONNAIRE_SCHEMA`` first, and a
+    ValueError names every invalid field.
+    """
+    values, errors = QUESTIONNAIRE_SCHEMA.validate_record(user_data)
+    if errors:
+        raise ValueError("; ".join(f"{key}: {error}" for key, error in errors.items()))
+    score, unknown = get_predictor(path).predict_record(values)
+    return score, stress_level(score), unknown
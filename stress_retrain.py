@@ -0,0 +1,183 @@
+"""Background retraining with atomic hot-swap of the shared model.
+
+``ModelHolder`` is the single process-wide reference that request handlers read
+once per request. Replacing it is one attribute assignment, so a reader always
+sees either the old or the new fully built ModelBundle, never a mix.
+``RetrainScheduler`` fits candidates in a separate process, promotes a
+candidate only if its hold-out RMSE is no worse than the current model's
+(within a tolerance), and keeps earlier versions for rollback.
+"""
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import stress_metrics
+from stress_model import artifact_stamp, load_artifact, save_artifact, train_from_source, train_model
+
+DEFAULT_HISTORY = 3
+DEFAULT_RMSE_TOLERANCE = 0.05
+DEFAULT_WATCH_INTERVAL = 30.0
+
+
+class ModelHolder:
+    """Swappable reference to the active ModelBundle, with a bounded rollback history."""
+
+    def __init__(self, bundle, history=DEFAULT_HISTORY):
+        self._bundle = bundle
+        self._previous = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    @property
+    def current(self):
+        # A plain attribute read: readers never take the lock
+        return self._bundle
+
+    def swap(self, bundle):
+        """Make ``bundle`` current; returns the bundle it replaced."""
+        with self._lock:
+            previous = self._bundle
+            self._previous.append(previous)
+            self._bundle = bundle
+        stress_metrics.count("model_swaps")
+        return previous
+
+    def rollback(self):
+        """Restore the most recently replaced bundle and return it."""
+        with self._lock:
+            if not self._previous:
+                raise RuntimeError("no earlier model version to roll back to")
+            self._bundle = self._previous.pop()
+        stress_metrics.count("model_rollbacks")
+        return self._bundle
+
+    def versions(self):
+        """Current version followed by the rollback history, newest first."""
+        with self._lock:
+            return [self._bundle.version] + [bundle.version for bundle in reversed(self._previous)]
+
+
+def fit_candidate(data_path=None, params=None, dedupe=False, backend=None):
+    """Train a candidate bundle; runs in the worker process."""
+    if data_path:
+        return train_from_source(data_path, params=params, dedupe=dedupe, backend=backend)
+    return train_model(params=params, dedupe=dedupe, backend=backend)
+
+
+class RetrainScheduler:
+    """Runs retrains in a worker process and hot-swaps accepted models into ``holder``.
+
+    When ``artifact_path`` is set, accepted models and rollbacks are also
+    written there, and :meth:`watch_artifact` can pick up artifacts written by
+    other processes (e.g. ``stress_cli.py train``) without blocking readers.
+    """
+
+    def __init__(self, holder, artifact_path=None, rmse_tolerance=DEFAULT_RMSE_TOLERANCE):
+        self.holder = holder
+        self.artifact_path = artifact_path
+        self.rmse_tolerance = rmse_tolerance
+        self.last_result = None
+        self._lock = threading.Lock()
+        self._pool = None
+        self._pending = None
+        self._started = None
+        self._watcher = None
+        self._stop = threading.Event()
+        self._stamp = artifact_stamp(artifact_path) if artifact_path else None
+
+    def _executor(self):
+        if self._pool is None:
+            # spawn keeps the worker free of the parent's threads and locks
+            self._pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+
+    @property
+    def running(self):
+        return self._pending is not None and not self._pending.done()
+
+    def submit(self, data_path=None, params=None, dedupe=False):
+        """Start a background retrain unless one is already running; returns its future."""
+        with self._lock:
+            if self.running:
+                return self._pending
+            current = self.holder.current
+            params = dict(current.params if params is None else params)
+            self._started = time.time()
+            self._pending = self._executor().submit(fit_candidate, data_path, params, dedupe, current.backend)
+            self._pending.add_done_callback(self._on_done)
+            return self._pending
+
+    def _on_done(self, future):
+        elapsed = time.time() - self._started
+        try:
+            self.last_result = dict(self.consider(future.result()), seconds=elapsed)
+        except Exception as exc:
+            # consider() may have swapped before persisting failed, so report what is serving
+            self.last_result = {"status": "failed", "error": repr(exc), "seconds": elapsed,
+                                "current_version": self.holder.current.version}
+
+    def consider(self, candidate):
+        """Promote ``candidate`` if its hold-out RMSE is within tolerance of the current model's."""
+        current = self.holder.current
+        current_rmse = current.metrics.get("rmse")
+        candidate_rmse = candidate.metrics.get("rmse")
+        result = {
+            "candidate_version": candidate.version,
+            "current_version": current.version,
+            "candidate_rmse": candidate_rmse,
+            "current_rmse": current_rmse,
+        }
+        if current_rmse is not None and candidate_rmse is not None \
+                and candidate_rmse > current_rmse * (1 + self.rmse_tolerance):
+            return dict(result, status="rejected")
+        self.holder.swap(candidate)
+        self._persist(candidate)
+        return dict(result, status="promoted")
+
+    def rollback(self):
+        bundle = self.holder.rollback()
+        self._persist(bundle)
+        self.last_result = {"status": "rolled_back", "current_version": bundle.version}
+        return bundle
+
+    def _persist(self, bundle):
+        if self.artifact_path:
+            save_artifact(bundle, self.artifact_path)
+            self._stamp = artifact_stamp(self.artifact_path)
+
+    def reload_if_changed(self):
+        """Load and swap in the artifact if another process replaced it; returns True on swap."""
+        if not self.artifact_path or not os.path.exists(self.artifact_path):
+            return False
+        stamp = artifact_stamp(self.artifact_path)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        bundle = load_artifact(self.artifact_path)
+        if bundle.version == self.holder.current.version:
+            return False
+        self.holder.swap(bundle)
+        self.last_result = {"status": "reloaded", "current_version": bundle.version}
+        return True
+
+    def watch_artifact(self, interval=DEFAULT_WATCH_INTERVAL):
+        """Poll the artifact from a daemon thread so new files load off the request path."""
+        if self._watcher is not None or not self.artifact_path:
+            return
+
+        def poll():
+            while not self._stop.wait(interval):
+                try:
+                    self.reload_if_changed()
+                except Exception as exc:
+                    self.last_result = {"status": "reload_failed", "error": repr(exc)}
+
+        self._watcher = threading.Thread(target=poll, name="stress-model-watcher", daemon=True)
+        self._watcher.start()
+
+    def shutdown(self):
+        self._stop.set()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
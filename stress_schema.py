@@ -0,0 +1,239 @@
+"""Declarative schema for the 12 assessment fields.
+
+Each ``Field`` declares its type, range, allowed categories and prompt once.
+``Schema.parse`` turns one raw answer into its typed value, raising a
+ValueError whose message can be shown to the user, and
+``Schema.validate_frame`` applies the same rules to whole DataFrame columns,
+reporting per-row errors with column-wise operations rather than a loop over
+rows. Category answers are normalised with ``normalize_category`` everywhere.
+"""
+import math
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from stress_features import FIELD_COLUMNS, normalize_category
+
+ERROR_COLUMNS = ["row", "field", "value", "error"]
+
+
+@dataclass(frozen=True)
+class Field:
+    key: str
+    label: str
+    prompt: str
+    kind: type
+    minimum: float = None
+    maximum: float = None
+    choices: tuple = None
+
+    @property
+    def column(self):
+        return FIELD_COLUMNS[self.key]
+
+    def question(self, occupations=()):
+        return self.prompt.format(occupations=", ".join(occupations))
+
+    def range_error(self):
+        return f"must be between {self.minimum:g} and {self.maximum:g}"
+
+    def choice_error(self, allowed):
+        return f"must be one of {', '.join(allowed)}"
+
+
+class CheckError(ValueError):
+    """An answer that is valid on its own but fails a cross-field ``Check``."""
+
+
+@dataclass(frozen=True)
+class Check:
+    """A rule across fields; ``predicate`` works on scalars and on whole columns alike."""
+    fields: tuple
+    message: str
+    predicate: object
+
+
+class Schema:
+    def __init__(self, fields, checks=()):
+        self.fields = tuple(fields)
+        self.checks = tuple(checks)
+        self.by_key = {field.key: field for field in self.fields}
+
+    def replace(self, key, **changes):
+        """A copy of this schema with ``changes`` applied to the field ``key``."""
+        fields = [replace(field, **changes) if field.key == key else field for field in self.fields]
+        return Schema(fields, self.checks)
+
+    def _allowed(self, field, choices):
+        if choices and field.key in choices:
+            return tuple(choices[field.key])
+        return field.choices
+
+    def parse(self, key, raw, choices=None):
+        """Typed value of one raw answer; ``choices`` overrides allowed categories per key."""
+        field = self.by_key[key]
+        text = str(raw).strip()
+        if field.kind is str:
+            value = normalize_category(text)
+            allowed = self._allowed(field, choices)
+            if not value or (allowed is not None and value not in allowed):
+                raise ValueError(field.choice_error(allowed) if allowed else "must not be empty")
+            return value
+        # The same rules as ``validate_frame``: any number pd.to_numeric reads,
+        # integral for int fields, so "30", "30.0" and "3e1" are all age 30
+        number = math.nan
+        if text.isascii() and "_" not in text:
+            try:
+                number = float(text)
+            except ValueError:
+                pass
+        if math.isnan(number):
+            raise ValueError("must be a whole number" if field.kind is int else "must be a number")
+        if field.kind is int and number % 1 != 0:
+            raise ValueError("must be a whole number")
+        if not field.minimum <= number <= field.maximum:
+            raise ValueError(field.range_error())
+        return field.kind(number)
+
+    def validate_record(self, record, choices=None):
+        """Parse every field of a dict; returns ``(values, errors)`` keyed by field key."""
+        values, errors = {}, {}
+        for field in self.fields:
+            if record.get(field.key) is None:
+                errors[field.key] = "is missing"
+                continue
+            try:
+                values[field.key] = self.parse(field.key, record[field.key], choices)
+            except ValueError as exc:
+                errors[field.key] = str(exc)
+        for check in self.failed_checks(values):
+            errors["+".join(check.fields)] = check.message
+        return values, errors
+
+    def failed_checks(self, values, key=None):
+        """Checks that ``values`` fails, skipping those with an unanswered field.
+
+        With ``key``, only the checks on that field, as run when it is answered.
+        """
+        return [
+            check for check in self.checks
+            if (key is None or key in check.fields)
+            and all(values.get(name) is not None for name in check.fields)
+            and not check.predicate(values)
+        ]
+
+    def validate_frame(self, df, choices=None, columns="key"):
+        """Validate and type every row of ``df`` at once.
+
+        ``columns`` says whether ``df`` is labelled by field key or by dataset
+        column name; the typed frame uses the same labels. Returns
+        ``(typed, errors)`` where ``errors`` has one row per failed rule:
+        the row label, field, raw value and message.
+        """
+        import pandas as pd
+
+        n_rows = len(df)
+        typed, problems = {}, []
+        for field in self.fields:
+            name = field.key if columns == "key" else field.column
+            if name not in df.columns:
+                problems.append((np.ones(n_rows, dtype=bool), name, None, "is missing"))
+                typed[field.key] = np.full(n_rows, np.nan)
+                continue
+            raw = df[name].to_numpy()
+            if field.kind is not str and raw.dtype.kind in "iuf":
+                numbers = raw.astype(np.float64)
+                missing = np.isnan(numbers)
+            else:
+                # Parse each distinct raw value once, then map the results back to rows
+                codes, uniques = pd.factorize(raw)
+                missing = codes < 0
+            problems.append((missing, name, raw, "is missing"))
+            if field.kind is str:
+                normalized = np.array([normalize_category(value) for value in uniques] + [None], dtype=object)
+                allowed = self._allowed(field, choices)
+                if allowed is not None:
+                    rejected = np.append(~np.isin(normalized[:-1], allowed), False)
+                    problems.append((rejected[codes], name, raw, field.choice_error(allowed)))
+                else:
+                    problems.append(((normalized == "")[codes], name, raw, "must not be empty"))
+                typed[field.key] = normalized[codes]
+                continue
+            if raw.dtype.kind not in "iuf":
+                parsed = pd.to_numeric(pd.Series(uniques, dtype=object).astype(str).str.strip(), errors="coerce")
+                numbers = np.append(parsed.to_numpy(dtype=np.float64), np.nan)[codes]
+            absent = np.isnan(numbers)
+            present = ~absent
+            problems.append((absent & ~missing, name, raw,
+                             "must be a whole number" if field.kind is int else "must be a number"))
+            with np.errstate(invalid="ignore"):
+                if field.kind is int:
+                    problems.append((present & (numbers % 1 != 0), name, raw, "must be a whole number"))
+                problems.append((present & ((numbers < field.minimum) | (numbers > field.maximum)), name, raw,
+                                 field.range_error()))
+            typed[field.key] = numbers
+        for check in self.checks:
+            present = np.logical_and.reduce([~np.isnan(typed[key]) for key in check.fields])
+            with np.errstate(invalid="ignore"):
+                passed = np.asarray(check.predicate(typed), dtype=bool)
+            name = "+".join(field.key if columns == "key" else field.column
+                            for field in (self.by_key[key] for key in check.fields))
+            problems.append((present & ~passed, name, None, check.message))
+
+        frames = [
+            pd.DataFrame({
+                "row": df.index[mask],
+                "field": name,
+                "value": raw[mask] if raw is not None else None,
+                "error": message,
+            })
+            for mask, name, raw, message in problems if mask.any()
+        ]
+        errors = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=ERROR_COLUMNS)
+        if columns != "key":
+            typed = {self.by_key[key].column: values for key, values in typed.items()}
+        return pd.DataFrame(typed, index=df.index, copy=False), errors
+
+
+def row_errors(errors):
+    """One "field: message; ..." string per invalid row label."""
+    if errors.empty:
+        return errors.set_index("row")["error"]
+    return (errors["field"] + ": " + errors["error"]).groupby(errors["row"], sort=False).agg("; ".join)
+
+
+FIELDS = (
+    Field('gender', "Gender", "Please enter your gender (Male/Female):", str, choices=("Male", "Female")),
+    Field('age', "Age", "What is your age?", int, 18, 100),
+    Field('occupation', "Occupation",
+          "What is your occupation? (Choose 'Others' if not listed: {occupations}):", str),
+    Field('sleep_duration', "Sleep per day (hours)", "How many hours do you sleep per day? (4-12)", float, 4, 12),
+    Field('sleep_quality', "Sleep quality", "Rate your sleep quality (1-10):", int, 1, 10),
+    Field('activity_level', "Physical activity level", "Rate your physical activity level (1-10):", int, 1, 10),
+    Field('bmi_category', "BMI category", "Enter your BMI category (Normal/Overweight/Obese):", str,
+          choices=("Normal", "Overweight", "Obese")),
+    Field('systolic_bp', "Systolic blood pressure", "Enter your systolic blood pressure (90-200):", int, 90, 200),
+    Field('diastolic_bp', "Diastolic blood pressure", "Enter your diastolic blood pressure (60-130):", int, 60, 130),
+    Field('heart_rate', "Heart rate", "Enter your heart rate (60-120):", int, 60, 120),
+    Field('daily_steps', "Daily steps", "Enter your daily steps (1000-20000):", int, 1000, 20000),
+    Field('sleep_disorder', "Sleep disorder", "Do you have any sleep disorder? (None/Sleep Apnea/Insomnia):", str,
+          choices=("None", "Sleep Apnea", "Insomnia")),
+)
+
+BLOOD_PRESSURE_CHECK = Check(
+    ("systolic_bp", "diastolic_bp"),
+    "systolic blood pressure must be higher than diastolic",
+    lambda values: values["systolic_bp"] > values["diastolic_bp"],
+)
+
+# Questionnaire, quick form and JSON API answers
+QUESTIONNAIRE_SCHEMA = Schema(FIELDS, checks=[BLOOD_PRESSURE_CHECK])
+
+# Survey exports in the dataset layout: activity is recorded in minutes per
+# day and BMI categories such as "Normal Weight" are left to the encoder,
+# which reports categories it has never seen.
+DATASET_SCHEMA = (
+    QUESTIONNAIRE_SCHEMA
+    .replace('activity_level', minimum=0, maximum=1440)
+    .replace('bmi_category', choices=None)
+)
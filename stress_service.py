@@ -0,0 +1,303 @@
+"""Headless HTTP/JSON stress prediction service built on asyncio.
+
+    POST /predict        {"gender": "Male", "age": 30, ...}
+    POST /predict/batch  {"records": [{...}, {...}]}
+    GET  /health
+    GET  /metrics        Prometheus text format
+
+Records use the questionnaire keys of ``st.session_state.user_data`` and go
+through the same schema, encoder and model as ``predict_stress``. A single
+invalid record is a 400; in a batch, invalid records get per-field ``errors``
+in place of a score while the rest are scored. Requests arriving
+within ``max_wait_ms`` of each other are coalesced into one model call of at
+most ``max_batch_size`` rows.
+"""
+import asyncio
+import json
+import logging
+import time
+
+import numpy as np
+
+import stress_metrics
+from stress_cache import PREDICTION_CACHE
+from stress_features import COLUMN_FIELDS, FIELD_COLUMNS
+from stress_predict import stress_level
+from stress_schema import QUESTIONNAIRE_SCHEMA
+
+DEFAULT_MAX_BATCH_SIZE = 64
+DEFAULT_MAX_WAIT_MS = 5.0
+MAX_BODY_BYTES = 10 * 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+
+class RequestError(Exception):
+    """A client error that is reported back as an HTTP status and JSON message."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def encode_record(encoder, record):
+    """Validate and encode one answer dict; returns ``(X, unknown)`` for a single row."""
+    if not isinstance(record, dict):
+        raise RequestError(400, "expected a JSON object of answers")
+    values, errors = QUESTIONNAIRE_SCHEMA.validate_record(record)
+    if errors:
+        raise RequestError(400, "; ".join(f"{key}: {error}" for key, error in errors.items()))
+    row, unknown = encoder.encode_record(values)
+    return row.reshape(1, -1), unknown
+
+
+def encode_records(encoder, records):
+    """Validate and encode a list of answer dicts column-wise.
+
+    Returns ``(X, valid, unknown, errors)``: the encoded valid rows, a boolean
+    mask of which records they are, per-record unknown categories, and
+    per-record ``{field: message}`` dicts (empty for valid records).
+    """
+    import pandas as pd
+
+    if not isinstance(records, list) or not records:
+        raise RequestError(400, "expected a non-empty list of records")
+    if not all(isinstance(record, dict) for record in records):
+        raise RequestError(400, "every record must be an object")
+    # Lists and objects are not answers (and cannot be factorized); they are
+    # validated as missing and then reported as what they are
+    nested = {}
+    for i, record in enumerate(records):
+        keys = [key for key in QUESTIONNAIRE_SCHEMA.by_key if isinstance(record.get(key), (list, dict))]
+        if keys:
+            nested[i] = keys
+    if nested:
+        records = [{key: value for key, value in record.items() if key not in nested[i]} if i in nested else record
+                   for i, record in enumerate(records)]
+    typed, failures = QUESTIONNAIRE_SCHEMA.validate_frame(
+        pd.DataFrame.from_records(records, columns=list(QUESTIONNAIRE_SCHEMA.by_key)))
+    errors = [{} for _ in records]
+    for row, field, error in zip(failures["row"], failures["field"], failures["error"]):
+        # The first failed rule per field, as validate_record reports it
+        errors[row].setdefault(field, error)
+    for i, keys in nested.items():
+        for key in keys:
+            errors[i][key] = "must be a single value"
+    valid = ~typed.index.isin(failures["row"])
+    unknown = [{} for _ in records]
+    X = np.zeros((0, encoder.n_features))
+    if valid.any():
+        X, masks = encoder.encode_frame(typed[valid].rename(columns=FIELD_COLUMNS))
+        rows = np.flatnonzero(valid)
+        for column, mask in masks.items():
+            values = typed.loc[valid, COLUMN_FIELDS[column]].to_numpy()
+            for i in np.flatnonzero(mask):
+                unknown[rows[i]][column] = values[i]
+    return X, valid, unknown, errors
+
+
+class MicroBatcher:
+    """Coalesces concurrently submitted rows into single vectorised predictions."""
+
+    def __init__(self, bundle, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.bundle = bundle
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batches = 0
+        self.rows = 0
+        self._queue = asyncio.Queue()
+        self._task = None
+
+    def start(self):
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def predict(self, X):
+        """Queue the encoded rows ``X`` and wait for their scores."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((X, future))
+        return await future
+
+    async def _collect(self):
+        items = [await self._queue.get()]
+        size = len(items[0][0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            items = await self._collect()
+            X = np.concatenate([rows for rows, _ in items]) if len(items) > 1 else items[0][0]
+            try:
+                # Off the event loop so new requests keep queueing while the model runs
+                scores = await loop.run_in_executor(None, self.bundle.predict, X)
+            except Exception as exc:
+                for _, future in items:
+                    if not future.done():
+                        future.set_exception(exc)
+                continue
+            self.batches += 1
+            self.rows += len(X)
+            start = 0
+            for rows, future in items:
+                if not future.done():
+                    future.set_result(scores[start:start + len(rows)])
+                start += len(rows)
+
+
+class StressService:
+    """Minimal HTTP/1.1 front end for a MicroBatcher."""
+
+    def __init__(self, bundle, max_batch_size=DEFAULT_MAX_BATCH_SIZE, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.bundle = bundle
+        self.batcher = MicroBatcher(bundle, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    def _result(self, score, unknown):
+        return {
+            "score": float(score),
+            "level": stress_level(score),
+            "unknown_categories": unknown,
+        }
+
+    async def handle(self, method, path, body):
+        """Dispatch one request; returns ``(status, payload)``.
+
+        A str payload is sent as plain text, anything else as JSON.
+        """
+        if path == "/metrics":
+            gauges = dict(PREDICTION_CACHE.gauges(), stress_service_batches=self.batcher.batches,
+                          stress_service_rows=self.batcher.rows)
+            return 200, stress_metrics.export_prometheus(gauges)
+        if path == "/health":
+            return 200, {
+                "status": "ok",
+                "model_version": self.bundle.version,
+                "backend": self.bundle.backend,
+                "batches": self.batcher.batches,
+                "rows": self.batcher.rows,
+            }
+        if path not in ("/predict", "/predict/batch"):
+            raise RequestError(404, f"unknown path {path}")
+        if method != "POST":
+            raise RequestError(405, "use POST")
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            raise RequestError(400, "request body is not valid JSON")
+
+        if path == "/predict":
+            X, unknown = encode_record(self.bundle.encoder, payload)
+            stress_metrics.count("service_requests")
+            scores = await self.batcher.predict(X)
+            result = self._result(scores[0], unknown)
+            result["model_version"] = self.bundle.version
+            return 200, result
+
+        records = payload.get("records") if isinstance(payload, dict) else payload
+        X, valid, unknown, errors = encode_records(self.bundle.encoder, records)
+        stress_metrics.count("service_batch_requests")
+        scores = iter(await self.batcher.predict(X) if len(X) else ())
+        return 200, {
+            "model_version": self.bundle.version,
+            "results": [
+                self._result(next(scores), record_unknown) if ok else {"errors": record_errors}
+                for ok, record_unknown, record_errors in zip(valid, unknown, errors)
+            ],
+        }
+
+    async def _read_request(self, reader):
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _ = request_line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "malformed request line")
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            raise RequestError(400, "invalid Content-Length header")
+        if length > MAX_BODY_BYTES:
+            raise RequestError(413, "request body too large")
+        body = await reader.readexactly(length) if length else b""
+        keep_alive = headers.get("connection", "").lower() != "close"
+        return method.upper(), target.split("?", 1)[0], body, keep_alive
+
+    async def _serve_connection(self, reader, writer):
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, body, keep_alive = request
+                    status, payload = await self.handle(method, path, body)
+                except RequestError as exc:
+                    status, payload = exc.status, {"error": exc.message}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    raise
+                except Exception:
+                    logger.exception("Error handling request")
+                    stress_metrics.count("service_errors")
+                    status, payload, keep_alive = 500, {"error": "internal server error"}, False
+                if isinstance(payload, str):
+                    data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    data, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000, ready=None):
+        """Run until cancelled; ``ready`` (an asyncio.Event) is set once listening."""
+        self.batcher.start()
+        server = await asyncio.start_server(self._serve_connection, host, port)
+        try:
+            async with server:
+                if ready is not None:
+                    ready.set()
+                await server.serve_forever()
+        finally:
+            await self.batcher.stop()
@@ -0,0 +1,65 @@
+"""Compact per-session questionnaire state.
+
+Each Streamlit session used to keep its answers as a dict of raw strings plus a
+parallel list of (question, answer) tuples. ``AssessmentAnswers`` stores each
+answer once, already typed, in a fixed ``__slots__`` layout. Category answers
+are interned, so every session that answers "Normal" shares one string. The
+model and its encoding metadata are never stored per session.
+"""
+import sys
+
+from stress_schema import QUESTIONNAIRE_SCHEMA, CheckError
+
+FIELD_TYPES = {field.key: field.kind for field in QUESTIONNAIRE_SCHEMA.fields}
+FIELD_ORDER = tuple(FIELD_TYPES)
+
+
+class AssessmentAnswers:
+    """Typed answers to the 12 questionnaire fields; unanswered fields are None.
+
+    Supports ``answers[key]`` so it can be passed wherever a ``user_data``
+    dict was expected.
+    """
+
+    __slots__ = FIELD_ORDER
+
+    def __init__(self, **values):
+        for key in FIELD_ORDER:
+            setattr(self, key, None)
+        for key, value in values.items():
+            self.set(key, value)
+
+    def set(self, key, raw, choices=None):
+        """Parse and validate ``raw`` (usually the text typed by the user) with the schema.
+
+        Raises ValueError with a user-facing message for invalid answers, or
+        its subclass CheckError when the answer contradicts an earlier one;
+        ``choices`` overrides the allowed categories per key.
+        """
+        value = QUESTIONNAIRE_SCHEMA.parse(key, raw, choices)
+        # Cross-field checks run as soon as their last field is answered
+        failed = QUESTIONNAIRE_SCHEMA.failed_checks(dict(self.as_dict(), **{key: value}), key)
+        if failed:
+            raise CheckError(failed[0].message)
+        if isinstance(value, str):
+            value = sys.intern(value)
+        setattr(self, key, value)
+
+    def __getitem__(self, key):
+        if key not in FIELD_TYPES:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in FIELD_TYPES and getattr(self, key) is not None
+
+    def display(self, key):
+        """The answer as shown back in the chat history."""
+        value = getattr(self, key)
+        return f"{value:g}" if isinstance(value, float) else str(value)
+
+    def is_complete(self):
+        return all(getattr(self, key) is not None for key in FIELD_ORDER)
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in FIELD_ORDER}
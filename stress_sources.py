@@ -0,0 +1,201 @@
+"""External training data: chunked CSV/Parquet readers and a memory-mapped feature cache.
+
+Survey exports use the same columns as the embedded dataset. They are streamed
+in chunks through the same cleaning and validation as ``stress_model.update_model``
+(rows failing ``stress_batch.validate_labelled`` are left out and reported) and
+encoded onto the columns ``pd.get_dummies(drop_first=True)`` would produce for
+the whole file. The encoded matrix is stored column-major in ``.npy`` files
+keyed by the file's content hash, so later training runs memory-map it instead
+of parsing the export again.
+"""
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import stress_metrics
+from stress_batch import validate_labelled
+from stress_data import TARGET_COLUMN, clean_dataframe
+from stress_features import CATEGORICAL_COLUMNS, FeatureEncoder
+from stress_schema import row_errors
+
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "features")
+# Bump whenever the cache layout or the cleaning/encoding changes
+CACHE_FORMAT = 2
+# Invalid rows kept in the cache metadata (with their errors) to show the user
+INVALID_SAMPLE = 10
+
+
+def iter_source_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Yield raw DataFrame chunks of at most ``chunksize`` rows from a .csv or .parquet file."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        yield from pd.read_csv(path, chunksize=chunksize)
+    elif extension in (".parquet", ".pq"):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Reading Parquet files requires pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    else:
+        raise ValueError(f"Unsupported data source {path!r}; expected .csv or .parquet")
+
+
+def iter_clean_chunks(path, chunksize=DEFAULT_CHUNKSIZE, invalid=None):
+    """Yield the valid rows of each chunk, typed and in ``clean_dataframe``'s column order.
+
+    Rows are numbered from 0 across the whole file. When ``invalid`` is a
+    list, each chunk's ``row_errors`` Series is appended to it.
+    """
+    start = 0
+    for chunk in iter_source_chunks(path, chunksize):
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        with stress_metrics.timer("clean_chunk"):
+            typed, y, errors = validate_labelled(chunk)
+            typed[TARGET_COLUMN] = y
+            df_cleaned = typed[clean_dataframe(chunk.iloc[:0]).columns]
+            if not errors.empty:
+                df_cleaned = df_cleaned[~df_cleaned.index.isin(errors['row'])]
+                if invalid is not None:
+                    invalid.append(row_errors(errors))
+            for column in CATEGORICAL_COLUMNS:
+                df_cleaned[column] = df_cleaned[column].astype(str).str.strip().str.title()
+        yield df_cleaned
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def dummy_feature_columns(df_cleaned, categories):
+    """Columns ``get_dummies(drop_first=True)`` yields on the full data, minus the target.
+
+    Numeric columns keep their order and come first, followed by each
+    categorical column's sorted categories without the first one.
+    """
+    numeric = [column for column in df_cleaned.columns
+               if column not in CATEGORICAL_COLUMNS and column != TARGET_COLUMN]
+    dummies = [f"{column}_{category}"
+               for column in df_cleaned.columns if column in CATEGORICAL_COLUMNS
+               for category in categories[column][1:]]
+    return numeric + dummies
+
+
+class FeatureCache:
+    """An encoded dataset on disk: column-major X and y memory-mapped read-only."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.X = np.load(os.path.join(directory, "X.npy"), mmap_mode="r")
+        self.y = np.load(os.path.join(directory, "y.npy"), mmap_mode="r")
+
+    @property
+    def feature_columns(self):
+        return self.meta["feature_columns"]
+
+    @property
+    def categories(self):
+        return self.meta["categories"]
+
+    @property
+    def data_hash(self):
+        return self.meta["data_hash"]
+
+    @property
+    def n_rows(self):
+        return self.meta["rows"]
+
+    @property
+    def invalid_rows(self):
+        return self.meta["invalid_rows"]
+
+    @property
+    def invalid_sample(self):
+        """``{row: message}`` for the first few rows left out of the cache."""
+        return {int(row): message for row, message in self.meta["invalid_sample"].items()}
+
+
+def build_feature_cache(path, directory, chunksize=DEFAULT_CHUNKSIZE, content_hash=None):
+    """Encode ``path`` into a new cache at ``directory`` with two streaming passes.
+
+    The first pass only collects categories and the row count, so the second
+    can encode every chunk onto the final column layout in place.
+    """
+    content_hash = content_hash or file_hash(path)
+    rows = 0
+    seen = {column: set() for column in CATEGORICAL_COLUMNS}
+    template = None
+    invalid = []
+    for df_cleaned in iter_clean_chunks(path, chunksize, invalid):
+        if template is None:
+            template = df_cleaned.iloc[:0]
+        rows += len(df_cleaned)
+        for column in CATEGORICAL_COLUMNS:
+            seen[column].update(df_cleaned[column].unique())
+    invalid = pd.concat(invalid).sort_index() if invalid else pd.Series(dtype=object)
+    if template is None:
+        raise ValueError(f"{path} contains no rows")
+    if not rows:
+        raise ValueError(f"none of the {len(invalid)} rows in {path} are valid "
+                         f"(row {invalid.index[0]}: {invalid.iloc[0]})")
+
+    categories = {column: sorted(values) for column, values in seen.items()}
+    feature_columns = dummy_feature_columns(template, categories)
+    encoder = FeatureEncoder(feature_columns, categories)
+
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    X = np.lib.format.open_memmap(os.path.join(tmp_dir, "X.npy"), mode="w+", dtype=np.float64,
+                                  shape=(rows, len(feature_columns)), fortran_order=True)
+    y = np.lib.format.open_memmap(os.path.join(tmp_dir, "y.npy"), mode="w+", dtype=np.float64, shape=(rows,))
+    start = 0
+    for df_cleaned in iter_clean_chunks(path, chunksize):
+        stop = start + len(df_cleaned)
+        X[start:stop], _ = encoder.encode_frame(df_cleaned)
+        y[start:stop] = df_cleaned[TARGET_COLUMN].to_numpy(dtype=np.float64)
+        start = stop
+    X.flush()
+    y.flush()
+    del X, y
+
+    meta = {
+        "format": CACHE_FORMAT,
+        "source": os.path.abspath(path),
+        "data_hash": content_hash,
+        "rows": rows,
+        "invalid_rows": len(invalid),
+        "invalid_sample": {str(row): message for row, message in invalid.head(INVALID_SAMPLE).items()},
+        "feature_columns": feature_columns,
+        "categories": categories,
+    }
+    with open(os.path.join(tmp_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    # Publish the finished cache in one rename; a concurrent builder may have won
+    try:
+        os.replace(tmp_dir, directory)
+    except OSError:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return FeatureCache(directory)
+
+
+def load_feature_cache(path, cache_dir=DEFAULT_CACHE_DIR, chunksize=DEFAULT_CHUNKSIZE):
+    """Memory-map the cached features for ``path``, building them on first use."""
+    content_hash = file_hash(path)
+    directory = os.path.join(cache_dir, f"{content_hash[:16]}-v{CACHE_FORMAT}")
+    if os.path.exists(os.path.join(directory, "meta.json")):
+        return FeatureCache(directory)
+    os.makedirs(cache_dir, exist_ok=True)
+    return build_feature_cache(path, directory, chunksize, content_hash)
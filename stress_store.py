@@ -0,0 +1,223 @@
+"""SQLite store of completed assessments.
+
+``AssessmentStore.record`` only puts the row on a queue; a background writer
+thread drains the queue and inserts whatever has accumulated in one
+transaction, so the Streamlit script never waits on disk. The database runs
+in WAL mode, letting the pooled read connections query history and trends
+while the writer commits.
+
+    store = AssessmentStore("assessments.db")
+    store.record(user_id, answers, "High", 7.1, model_version)
+    store.history(user_id)
+"""
+import atexit
+import contextlib
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import stress_metrics
+from stress_schema import QUESTIONNAIRE_SCHEMA
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_PATH = os.environ.get(
+    "STRESS_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "assessments.db"),
+)
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_INTERVAL = 0.2
+DEFAULT_POOL_SIZE = 4
+BUSY_TIMEOUT_MS = 5000
+# Backoff between attempts at a batch while another connection holds the write lock
+RETRY_DELAY = 0.05
+MAX_RETRY_DELAY = 2.0
+# SQLite primary result codes for a database locked by another connection
+SQLITE_BUSY, SQLITE_LOCKED = 5, 6
+
+SQL_TYPES = {str: "TEXT", int: "INTEGER", float: "REAL"}
+ANSWER_COLUMNS = tuple(field.key for field in QUESTIONNAIRE_SCHEMA.fields)
+COLUMNS = ("user_id", "created_at", "model_version", "level", "score") + ANSWER_COLUMNS
+
+SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS assessments (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    model_version TEXT,
+    level TEXT NOT NULL,
+    score REAL NOT NULL,
+    {", ".join(f"{field.key} {SQL_TYPES[field.kind]}" for field in QUESTIONNAIRE_SCHEMA.fields)}
+);
+CREATE INDEX IF NOT EXISTS assessments_user ON assessments (user_id, created_at);
+CREATE INDEX IF NOT EXISTS assessments_created ON assessments (created_at);
+"""
+INSERT_SQL = f"INSERT INTO assessments ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+# strftime formats for the trend buckets
+BUCKETS = {"hour": "%Y-%m-%d %H:00", "day": "%Y-%m-%d", "week": "%Y-%W", "month": "%Y-%m"}
+
+_STOP = object()
+
+
+def connect(path):
+    connection = sqlite3.connect(path, timeout=BUSY_TIMEOUT_MS / 1000, check_same_thread=False)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    # WAL keeps commits durable across application crashes with one fsync per checkpoint
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+
+def is_transient(exc):
+    """Whether a write failed only because another connection held the lock."""
+    code = getattr(exc, "sqlite_errorcode", None)
+    if code is None:  # Python < 3.11 has no error codes on the exception
+        return isinstance(exc, sqlite3.OperationalError) and ("locked" in str(exc) or "busy" in str(exc))
+    return code & 0xFF in (SQLITE_BUSY, SQLITE_LOCKED)
+
+
+class AssessmentStore:
+    """Queued, batched writes on one thread; reads from a small connection pool.
+
+    Subclasses can add tables through ``schema_sql`` and keep them in step
+    with the assessments by extending :meth:`write_batch`.
+    """
+
+    schema_sql = SCHEMA_SQL
+
+    def __init__(self, path=DEFAULT_STORE_PATH, batch_size=DEFAULT_BATCH_SIZE,
+                 flush_interval=DEFAULT_FLUSH_INTERVAL, pool_size=DEFAULT_POOL_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.last_error = None
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        with contextlib.closing(connect(path)) as connection:
+            connection.executescript(self.schema_sql)
+        self._queue = queue.Queue()
+        self._pool = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put(connect(path))
+        self._writer = threading.Thread(target=self._write_loop, name="stress-store-writer", daemon=True)
+        self._writer.start()
+        # The writer is a daemon thread; drain its queue before the interpreter exits
+        atexit.register(self.close)
+
+    def record(self, user_id, answers, level, score, model_version=None, created_at=None):
+        """Queue one completed assessment; returns immediately."""
+        row = (user_id, time.time() if created_at is None else created_at, model_version, level, float(score))
+        self._queue.put(row + tuple(answers[key] for key in ANSWER_COLUMNS))
+        stress_metrics.count("assessments_queued")
+
+    def _drain(self):
+        """Block for one row, then collect more until the batch is full or the interval passes."""
+        rows = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while rows[-1] is not _STOP and len(rows) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                rows.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return rows
+
+    def _write_loop(self):
+        connection = connect(self.path)
+        try:
+            while True:
+                rows = self._drain()
+                stop = rows[-1] is _STOP
+                batch = rows[:-1] if stop else rows
+                if batch:
+                    self._write(connection, batch)
+                for _ in rows:
+                    self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            connection.close()
+
+    def _write(self, connection, batch):
+        """Commit ``batch``, retrying for as long as the database is locked.
+
+        Only a non-transient error (a full disk, a corrupt file) drops the
+        batch, and then the rows are logged and counted.
+        """
+        delay = RETRY_DELAY
+        while True:
+            try:
+                with stress_metrics.timer("store_write"), connection:
+                    self.write_batch(connection, batch)
+            except sqlite3.Error as exc:
+                self.last_error = repr(exc)
+                if not is_transient(exc):
+                    self.dropped += len(batch)
+                    stress_metrics.count("store_write_errors")
+                    stress_metrics.count("assessments_dropped", len(batch))
+                    logger.error("Dropped %d assessments after %r: %r", len(batch), exc, batch)
+                    return
+                stress_metrics.count("store_write_retries")
+                logger.warning("Assessment store is locked; retrying %d rows in %.2fs", len(batch), delay)
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+            else:
+                self.written += len(batch)
+                self.batches += 1
+                stress_metrics.count("assessments_written", len(batch))
+                return
+
+    def write_batch(self, connection, rows):
+        """Insert ``rows`` inside the writer's open transaction."""
+        connection.executemany(INSERT_SQL, rows)
+
+    def flush(self):
+        """Wait until every queued assessment has been written (or dropped on a non-transient error)."""
+        self._queue.join()
+
+    def close(self):
+        """Write everything still queued, stop the writer and close the connections."""
+        atexit.unregister(self.close)
+        if self._writer.is_alive():
+            self._queue.put(_STOP)
+            self._writer.join()
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+    @contextlib.contextmanager
+    def reader(self):
+        """Borrow a read connection from the pool."""
+        connection = self._pool.get()
+        try:
+            yield connection
+        finally:
+            self._pool.put(connection)
+
+    def history(self, user_id, limit=50):
+        """A user's assessments, newest first."""
+        with self.reader() as connection:
+            rows = connection.execute(
+                "SELECT * FROM assessments WHERE user_id = ? ORDER BY created_at DESC LIMIT ?", (user_id, limit)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def trend(self, user_id, bucket="day", since=None):
+        """Count and mean/min/max score per time bucket for a user, oldest first."""
+        fmt = BUCKETS[bucket]
+        with self.reader() as connection:
+            rows = connection.execute(
+                "SELECT strftime(?, created_at, 'unixepoch') AS bucket, COUNT(*) AS assessments, "
+                "AVG(score) AS mean_score, MIN(score) AS min_score, MAX(score) AS max_score "
+                "FROM assessments WHERE user_id = ? AND created_at >= ? GROUP BY bucket ORDER BY bucket",
+                (fmt, user_id, since or 0),
+            ).fetchall()
+        return [dict(row) for row in rows]
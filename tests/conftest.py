@@ -0,0 +1,30 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stress_data import clean_dataframe, load_raw_dataframe  # noqa: E402
+from stress_features import FIELD_COLUMNS  # noqa: E402
+from stress_model import train_model  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def df_cleaned():
+    return clean_dataframe(load_raw_dataframe())
+
+
+@pytest.fixture(scope="session")
+def bundle():
+    return train_model()
+
+
+@pytest.fixture(scope="session")
+def records(df_cleaned):
+    """The embedded dataset as questionnaire answer dicts."""
+    columns = {column: key for key, column in FIELD_COLUMNS.items()}
+    return [
+        {columns[column]: value for column, value in row.items() if column in columns}
+        for row in df_cleaned.to_dict("records")
+    ]
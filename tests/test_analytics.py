@@ -0,0 +1,56 @@
+import threading
+
+import pytest
+
+import stress_store
+from stress_analytics import RollupStore
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(stress_store, "BUSY_TIMEOUT_MS", 50)
+    store = RollupStore(str(tmp_path / "assessments.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def rollup_rows(store):
+    with store.reader() as connection:
+        return [tuple(row) for row in connection.execute("SELECT * FROM rollups ORDER BY dimension, value, bucket")]
+
+
+def record_all(store, records, user_id, start):
+    for i, record in enumerate(records):
+        score = 1 + i % 10
+        level = "High" if score > 6 else "Medium" if score > 3 else "Low"
+        store.record(user_id, record, level, float(score), created_at=start + i * 3600.0)
+
+
+def test_incremental_rollups_match_rebuild(store, records):
+    record_all(store, records, "u1", 1_700_000_000.0)
+    store.flush()
+    incremental = rollup_rows(store)
+    assert store.rebuild() == len(records)
+    assert rollup_rows(store) == pytest.approx(incremental)
+    overall = store.rollup("all", bucket="month")
+    assert sum(row["count"] for row in overall) == len(records)
+
+
+def test_rebuild_during_writes_loses_and_doubles_nothing(store, records):
+    record_all(store, records * 5, "u1", 1_700_000_000.0)
+    store.flush()
+    writer = threading.Thread(target=record_all, args=(store, records, "u2", 1_710_000_000.0))
+    writer.start()
+    store.rebuild()
+    writer.join()
+    store.flush()
+    assert store.dropped == 0
+    live = rollup_rows(store)
+    assert sum(row["count"] for row in store.rollup("all", bucket="month")) == len(records) * 6
+    store.rebuild()
+    assert rollup_rows(store) == pytest.approx(live)
+
+
+def test_unknown_bucket_is_rejected(store):
+    with pytest.raises(ValueError, match="Unknown bucket"):
+        store.rollup("all", bucket="hour")
@@ -0,0 +1,48 @@
+import numpy as np
+
+from stress_cache import PredictionCache
+from stress_compact import model_params
+from stress_model import train_model
+
+
+def row(value):
+    return np.array([value], dtype=np.float64)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = PredictionCache(maxsize=2)
+    cache.get_or_compute("v1", row(1), lambda: 1.0)
+    cache.get_or_compute("v1", row(2), lambda: 2.0)
+    assert cache.get_or_compute("v1", row(1), lambda: -1.0) == 1.0
+    cache.get_or_compute("v1", row(3), lambda: 3.0)
+    assert cache.get_or_compute("v1", row(2), lambda: -2.0) == -2.0
+    assert cache.stats()["hits"] == 1 and cache.stats()["evictions"] == 2
+
+
+def test_new_model_version_clears_the_cache():
+    cache = PredictionCache()
+    cache.get_or_compute("v1", row(1), lambda: 1.0)
+    assert cache.get_or_compute("v2", row(1), lambda: 5.0) == 5.0
+    stats = cache.stats()
+    assert (stats["version"], stats["size"], stats["hits"], stats["misses"]) == ("v2", 1, 0, 2)
+
+
+def test_result_computed_under_a_replaced_version_is_not_stored():
+    cache = PredictionCache()
+
+    def compute_while_swapped():
+        cache.get_or_compute("v2", row(9), lambda: 9.0)
+        return 1.0
+
+    assert cache.get_or_compute("v1", row(1), compute_while_swapped) == 1.0
+    assert cache.get_or_compute("v2", row(1), lambda: 2.0) == 2.0
+
+
+def test_swapped_model_never_gets_the_old_models_scores(records, bundle):
+    other = train_model(params=model_params(25, max_depth=3, min_samples_leaf=5))
+    cache = PredictionCache()
+    answers = dict(records[0], activity_level=5)
+    expected = [model.predict_record(answers, cache=PredictionCache(maxsize=0))[0] for model in (bundle, other)]
+    assert expected[0] != expected[1]
+    for model, score in zip((bundle, other, bundle), expected + expected[:1]):
+        assert model.predict_record(answers, cache=cache)[0] == score
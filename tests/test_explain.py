@@ -0,0 +1,27 @@
+import numpy as np
+
+from stress_data import encode_dataframe
+
+
+def test_contributions_add_up_to_prediction(df_cleaned, bundle):
+    X = encode_dataframe(df_cleaned)[0].to_numpy(dtype=np.float64)
+    explainer = bundle.explainer
+    contributions = explainer.contributions(X, chunk_rows=50)
+    assert contributions.shape == (len(X), len(explainer.fields))
+    np.testing.assert_allclose(explainer.bias + contributions.sum(axis=1), bundle.engine.predict(X), atol=1e-9)
+
+
+def test_explain_record_adds_up_to_record_score(records, bundle):
+    for record in records[:20]:
+        score, _ = bundle.predict_record(record)
+        explanation = bundle.explainer.explain_record(record)
+        assert set(explanation) == set(record)
+        assert abs(bundle.explainer.bias + sum(explanation.values()) - score) < 1e-9
+
+
+def test_top_drivers_are_largest_by_magnitude(records, bundle):
+    explanation = bundle.explainer.explain_record(records[0])
+    drivers = bundle.explainer.top_drivers(records[0], n=3)
+    assert len(drivers) == 3
+    smallest = min(abs(value) for _, value in drivers)
+    assert all(abs(value) <= smallest for key, value in explanation.items() if key not in dict(drivers))
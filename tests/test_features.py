@@ -0,0 +1,27 @@
+import numpy as np
+
+from stress_data import encode_dataframe
+
+
+def test_encode_frame_matches_get_dummies(df_cleaned, bundle):
+    X_dummies, _ = encode_dataframe(df_cleaned)
+    X, unknown = bundle.encoder.encode_frame(df_cleaned)
+    assert list(X_dummies.columns) == bundle.encoder.feature_columns
+    np.testing.assert_array_equal(X, X_dummies.to_numpy(dtype=np.float64))
+    assert unknown == {}
+
+
+def test_encode_record_matches_encode_frame(df_cleaned, records, bundle):
+    X, _ = bundle.encoder.encode_frame(df_cleaned)
+    for i, record in enumerate(records):
+        row, unknown = bundle.encoder.encode_record(record)
+        np.testing.assert_array_equal(row, X[i])
+        assert unknown == {}
+
+
+def test_unknown_category_is_reported_and_encoded_as_baseline(records, bundle):
+    record = dict(records[0], occupation="astronaut")
+    row, unknown = bundle.encoder.encode_record(record)
+    assert unknown == {"Occupation": "Astronaut"}
+    occupation_columns = [i for i, column in enumerate(bundle.feature_columns) if column.startswith("Occupation_")]
+    assert not row[occupation_columns].any()
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from stress_compact import model_params
+from stress_data import encode_dataframe
+from stress_forest import FlatForest
+from stress_model import train_model
+
+
+@pytest.fixture(scope="module")
+def X(df_cleaned):
+    return encode_dataframe(df_cleaned)[0].to_numpy(dtype=np.float64)
+
+
+@pytest.fixture(scope="module", params=[None, model_params(25, max_depth=6, min_samples_leaf=2)],
+                ids=["default", "shallow"])
+def forest_bundle(request, bundle):
+    return bundle if request.param is None else train_model(params=request.param)
+
+
+def test_flat_forest_matches_sklearn(forest_bundle, X):
+    engine = FlatForest.from_sklearn(forest_bundle.model)
+    np.testing.assert_allclose(engine.predict(X), forest_bundle.model.predict(X), rtol=1e-12)
+
+
+def test_chunked_predict_matches_single_pass(forest_bundle, X):
+    engine = forest_bundle.engine
+    np.testing.assert_array_equal(engine.predict(X, chunk_rows=7), engine.predict(X, chunk_rows=len(X)))
+
+
+def test_compact_forest_keeps_every_split(forest_bundle, X):
+    engine = forest_bundle.engine
+    compact = engine.compact()
+    assert compact.nbytes < engine.nbytes
+    np.testing.assert_array_equal(compact.leaves(X), engine.leaves(X))
+    # Only the leaf values are rounded, to float32
+    np.testing.assert_allclose(compact.predict(X), forest_bundle.model.predict(X), rtol=1e-6)
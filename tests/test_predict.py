@@ -0,0 +1,28 @@
+import pytest
+
+from stress_model import save_artifact
+from stress_predict import predict, runtime_path
+
+
+@pytest.fixture(scope="module")
+def runtime(bundle, tmp_path_factory):
+    artifact = str(tmp_path_factory.mktemp("models") / "stress_model.joblib")
+    save_artifact(bundle, artifact)
+    return runtime_path(artifact)
+
+
+def test_predict_matches_bundle(records, bundle, runtime):
+    answers = dict(records[0], activity_level=5)
+    score, level, unknown = predict(answers, path=runtime)
+    assert score == pytest.approx(bundle.predict_record(answers)[0])
+    assert level in ("High", "Medium", "Low") and unknown == {}
+
+
+@pytest.mark.parametrize("change, message", [
+    ({"age": "abc"}, "age: must be a whole number"),
+    ({"age": 500}, "age: must be between 18 and 100"),
+    ({"systolic_bp": 100, "diastolic_bp": 110}, "must be higher than diastolic"),
+])
+def test_predict_rejects_invalid_answers(records, runtime, change, message):
+    with pytest.raises(ValueError, match=message):
+        predict(dict(records[0], activity_level=5, **change), path=runtime)
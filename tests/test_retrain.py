@@ -0,0 +1,76 @@
+import dataclasses
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import stress_retrain
+from stress_retrain import ModelHolder, RetrainScheduler
+
+
+def variant(bundle, version, rmse):
+    return dataclasses.replace(bundle, version=version, metrics=dict(bundle.metrics, rmse=rmse))
+
+
+def test_swap_and_rollback(bundle):
+    first, second, third = (variant(bundle, f"v{i}", 0.2) for i in (1, 2, 3))
+    holder = ModelHolder(first, history=2)
+    assert holder.swap(second) is first
+    holder.swap(third)
+    assert holder.current is third
+    assert holder.versions() == ["v3", "v2", "v1"]
+    assert holder.rollback() is second
+    assert holder.rollback() is first
+    with pytest.raises(RuntimeError):
+        holder.rollback()
+
+
+def test_history_is_bounded(bundle):
+    holder = ModelHolder(variant(bundle, "v0", 0.2), history=2)
+    for i in range(1, 5):
+        holder.swap(variant(bundle, f"v{i}", 0.2))
+    assert holder.versions() == ["v4", "v3", "v2"]
+
+
+def test_candidate_promoted_only_within_tolerance(bundle):
+    holder = ModelHolder(variant(bundle, "v1", 0.20))
+    scheduler = RetrainScheduler(holder, rmse_tolerance=0.05)
+    assert scheduler.consider(variant(bundle, "worse", 0.22))["status"] == "rejected"
+    assert holder.current.version == "v1"
+    assert scheduler.consider(variant(bundle, "close", 0.205))["status"] == "promoted"
+    assert holder.current.version == "close"
+
+
+@pytest.fixture
+def scheduler(bundle, monkeypatch):
+    holder = ModelHolder(variant(bundle, "v1", 0.2))
+    scheduler = RetrainScheduler(holder, artifact_path="unused.joblib")
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(scheduler, "_executor", lambda: pool)
+    monkeypatch.setattr(stress_retrain, "fit_candidate", lambda *args: variant(bundle, "v2", 0.2))
+    return scheduler
+
+
+def run_retrain(scheduler):
+    scheduler.submit()
+    # The worker thread runs the done callback before it exits
+    scheduler._executor().shutdown(wait=True)
+
+
+def test_retrain_promotes_and_persists(scheduler, monkeypatch):
+    saved = []
+    monkeypatch.setattr(stress_retrain, "save_artifact", lambda bundle, path: saved.append(bundle.version))
+    monkeypatch.setattr(stress_retrain, "artifact_stamp", lambda path: None)
+    run_retrain(scheduler)
+    assert saved == ["v2"]
+    assert scheduler.last_result["status"] == "promoted"
+
+
+def test_failed_persist_is_recorded(scheduler, monkeypatch):
+    def fail(bundle, path):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(stress_retrain, "save_artifact", fail)
+    run_retrain(scheduler)
+    assert scheduler.last_result["status"] == "failed"
+    assert "disk full" in scheduler.last_result["error"]
+    assert scheduler.last_result["current_version"] == "v2"
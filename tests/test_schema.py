@@ -0,0 +1,69 @@
+import math
+
+import pandas as pd
+import pytest
+
+from stress_schema import QUESTIONNAIRE_SCHEMA
+from stress_service import encode_record, encode_records, RequestError
+
+RAW_NUMBERS = ["30", " 30 ", "30.0", "3e1", "+30", 30, 30.0, "30.5", 30.5, "1_000", "1,000", "abc", "", "nan",
+               "inf", "-5", "5.", "150", True]
+RAW_CATEGORIES = ["Male", " male ", "FEMALE", "other", "", 1]
+
+
+def parsed(key, raw):
+    try:
+        return QUESTIONNAIRE_SCHEMA.parse(key, raw)
+    except ValueError as exc:
+        return str(exc)
+
+
+@pytest.mark.parametrize("key", ["age", "sleep_duration", "heart_rate"])
+def test_parse_agrees_with_validate_frame_on_numbers(key):
+    typed, errors = QUESTIONNAIRE_SCHEMA.validate_frame(pd.DataFrame({key: pd.Series(RAW_NUMBERS, dtype=object)}))
+    first_error = errors[errors["field"] == key].groupby("row")["error"].first()
+    for i, raw in enumerate(RAW_NUMBERS):
+        expected = parsed(key, raw)
+        if isinstance(expected, str):
+            assert first_error.get(i) == expected, raw
+        else:
+            assert i not in first_error.index, raw
+            assert typed[key][i] == expected and not math.isnan(typed[key][i])
+
+
+def test_parse_agrees_with_validate_frame_on_categories():
+    typed, errors = QUESTIONNAIRE_SCHEMA.validate_frame(
+        pd.DataFrame({"gender": pd.Series(RAW_CATEGORIES, dtype=object)}))
+    first_error = errors[errors["field"] == "gender"].groupby("row")["error"].first()
+    for i, raw in enumerate(RAW_CATEGORIES):
+        expected = parsed("gender", raw)
+        if expected in ("Male", "Female"):
+            assert typed["gender"][i] == expected
+        else:
+            assert first_error.get(i) == expected, raw
+
+
+def test_single_and_batch_endpoints_agree(records, bundle):
+    # The dataset records activity in minutes; the questionnaire asks for 1-10
+    answers = [dict(record, activity_level=5) for record in records[:7]]
+    batch = [
+        answers[0],
+        dict(answers[1], age="30.0"),
+        dict(answers[2], age=30.5),
+        dict(answers[3], systolic_bp=90, diastolic_bp=120),
+        dict(answers[4], gender="other", heart_rate="fast"),
+        {key: value for key, value in answers[5].items() if key != "occupation"},
+        dict(answers[6], age=[30]),
+    ]
+    X, valid, _, errors = encode_records(bundle.encoder, batch)
+    for i, record in enumerate(batch):
+        try:
+            row, _ = encode_record(bundle.encoder, record)
+        except RequestError as exc:
+            assert not valid[i]
+            assert exc.status == 400
+            assert exc.message.split(": ")[0] in errors[i]
+        else:
+            assert valid[i] and errors[i] == {}
+            assert (row[0] == X[valid[:i].sum()]).all()
+    assert list(valid) == [True, True, False, False, False, False, False]
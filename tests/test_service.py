@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from stress_service import MicroBatcher, StressService
+
+
+def test_concurrent_rows_are_scored_together(bundle, df_cleaned):
+    X = bundle.encoder.encode_frame(df_cleaned)[0][:20]
+
+    async def main():
+        batcher = MicroBatcher(bundle, max_batch_size=64, max_wait_ms=50)
+        batcher.start()
+        try:
+            scores = await asyncio.gather(*(batcher.predict(X[i:i + 1]) for i in range(len(X))))
+        finally:
+            await batcher.stop()
+        return batcher, np.concatenate(scores)
+
+    batcher, scores = asyncio.run(main())
+    np.testing.assert_allclose(scores, bundle.predict(X))
+    assert batcher.rows == len(X)
+    assert batcher.batches < len(X)
+
+
+def test_model_error_reaches_every_waiting_request(bundle):
+    class Broken:
+        def predict(self, X):
+            raise RuntimeError("model failed")
+
+    async def main():
+        batcher = MicroBatcher(Broken(), max_wait_ms=50)
+        batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.predict(np.zeros((1, 3))) for _ in range(3)),
+                                        return_exceptions=True)
+        finally:
+            await batcher.stop()
+
+    assert [str(result) for result in asyncio.run(main())] == ["model failed"] * 3
+
+
+def exchange(service, request):
+    """Send one raw HTTP request to ``service``; returns ``(status, payload)``."""
+    async def main():
+        service.batcher.start()
+        server = await asyncio.start_server(service._serve_connection, "127.0.0.1", 0)
+        try:
+            reader, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        finally:
+            server.close()
+            await service.batcher.stop()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+
+    return asyncio.run(main())
+
+
+def post(body, headers=""):
+    return (f"POST /predict HTTP/1.1\r\nConnection: close\r\n{headers}"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+
+def test_predict_over_http(bundle, records):
+    answers = dict(records[0], activity_level=5)
+    status, payload = exchange(StressService(bundle), post(json.dumps(answers).encode()))
+    assert status == 200
+    assert payload["score"] == pytest.approx(bundle.predict_record(answers)[0])
+
+
+@pytest.mark.parametrize("request_bytes", [
+    b"POST /predict HTTP/1.1\r\nContent-Length: ten\r\n\r\n",
+    b"POST /predict HTTP/1.1\r\nContent-Length: -5\r\n\r\n",
+])
+def test_bad_content_length_is_a_400(bundle, request_bytes):
+    assert exchange(StressService(bundle), request_bytes) == (400, {"error": "invalid Content-Length header"})
+
+
+def test_unexpected_error_is_a_500(bundle, monkeypatch):
+    service = StressService(bundle)
+
+    async def fail(method, path, body):
+        raise KeyError("boom")
+
+    monkeypatch.setattr(service, "handle", fail)
+    assert exchange(service, post(b"{}")) == (500, {"error": "internal server error"})
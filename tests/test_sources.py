@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from stress_data import encode_dataframe, load_raw_dataframe
+from stress_sources import load_feature_cache
+
+
+@pytest.fixture(scope="module")
+def raw():
+    return load_raw_dataframe().astype(object)
+
+
+def test_cache_matches_in_memory_encoding(raw, df_cleaned, tmp_path):
+    raw.to_csv(tmp_path / "survey.csv", index=False)
+    cache = load_feature_cache(str(tmp_path / "survey.csv"), str(tmp_path / "cache"), chunksize=100)
+    X, y = encode_dataframe(df_cleaned)
+    assert cache.feature_columns == list(X.columns)
+    np.testing.assert_array_equal(cache.X, X.to_numpy(dtype=np.float64))
+    np.testing.assert_array_equal(cache.y, y.to_numpy(dtype=np.float64))
+    assert cache.invalid_rows == 0
+
+
+def test_invalid_rows_are_left_out_and_reported(raw, tmp_path):
+    bad = raw.copy()
+    bad.loc[3, "Blood Pressure"] = "12080"
+    bad.loc[5, "Blood Pressure"] = None
+    bad.loc[7, "Quality of Sleep"] = -50
+    bad.loc[150, "Age"] = "abc"
+    bad.loc[160, "Stress Level"] = None
+    bad.to_csv(tmp_path / "survey.csv", index=False)
+    cache = load_feature_cache(str(tmp_path / "survey.csv"), str(tmp_path / "cache"), chunksize=100)
+    assert cache.n_rows == len(raw) - 5
+    assert not np.isnan(cache.X).any()
+    assert cache.invalid_rows == 5
+    assert cache.invalid_sample == {
+        3: "Blood Pressure: must be a reading like 120/80",
+        5: "Blood Pressure: is missing",
+        7: "Quality of Sleep: must be between 1 and 10",
+        150: "Age: must be a whole number",
+        160: "Stress Level: is missing",
+    }
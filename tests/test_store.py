@@ -0,0 +1,48 @@
+import sqlite3
+import time
+
+import pytest
+
+import stress_store
+from stress_store import ANSWER_COLUMNS, AssessmentStore
+
+ANSWERS = {key: 1 for key in ANSWER_COLUMNS}
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # Give up on the lock quickly so the writer has to retry
+    monkeypatch.setattr(stress_store, "BUSY_TIMEOUT_MS", 50)
+    store = AssessmentStore(str(tmp_path / "assessments.db"), flush_interval=0.01)
+    yield store
+    store.close()
+
+
+def test_records_are_written_and_read_back(store):
+    for score in (3.0, 5.0, 7.0):
+        store.record("u1", ANSWERS, "Medium", score, created_at=score)
+    store.record("u2", ANSWERS, "Low", 2.0)
+    store.flush()
+    assert [row["score"] for row in store.history("u1")] == [7.0, 5.0, 3.0]
+    assert store.trend("u1")[0]["assessments"] == 3
+
+
+def test_no_writes_lost_while_the_database_is_locked(store):
+    locker = sqlite3.connect(store.path, isolation_level=None)
+    locker.execute("BEGIN IMMEDIATE")
+    for _ in range(5):
+        store.record("u1", ANSWERS, "High", 7.0)
+    time.sleep(0.5)
+    assert store.written == 0
+    locker.execute("COMMIT")
+    locker.close()
+    store.flush()
+    assert (store.written, store.dropped) == (5, 0)
+    assert len(store.history("u1")) == 5
+
+
+def test_non_transient_errors_drop_and_count_the_batch(store):
+    store.record("u1", ANSWERS, None, 7.0)  # level is NOT NULL
+    store.flush()
+    assert (store.written, store.dropped) == (0, 1)
+    assert "IntegrityError" in store.last_error
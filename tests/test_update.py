@@ -0,0 +1,38 @@
+import pytest
+
+from stress_data import load_raw_dataframe
+from stress_model import update_model
+
+
+@pytest.fixture(scope="module")
+def new_rows():
+    return load_raw_dataframe().sample(40, random_state=0).reset_index(drop=True).astype(object)
+
+
+def test_update_grows_forest_and_leaves_live_bundle_alone(bundle, new_rows):
+    n_trees = len(bundle.model.estimators_)
+    updated, unknown, invalid = update_model(bundle, new_rows, add_trees=5, retire_oldest=3)
+    assert len(updated.model.estimators_) == n_trees + 2
+    assert updated.model.estimators_[0] is bundle.model.estimators_[3]
+    assert len(bundle.model.estimators_) == n_trees
+    assert updated.version != bundle.version
+    assert unknown == {} and invalid.empty
+    assert updated.metrics["updates"][-1]["rows"] == len(new_rows)
+
+
+def test_invalid_rows_are_skipped_and_reported(bundle, new_rows):
+    rows = new_rows.copy()
+    rows.loc[2, "Stress Level"] = 42
+    rows.loc[5, "Blood Pressure"] = "high"
+    updated, _, invalid = update_model(bundle, rows, add_trees=2)
+    assert invalid.to_dict() == {
+        2: "Stress Level: must be a number between 1 and 10",
+        5: "Blood Pressure: must be a reading like 120/80",
+    }
+    update = updated.metrics["updates"][-1]
+    assert (update["rows"], update["invalid_rows"]) == (len(rows) - 2, 2)
+
+
+def test_no_valid_rows_is_an_error(bundle, new_rows):
+    with pytest.raises(ValueError, match="none of the 40 new rows are valid"):
+        update_model(bundle, new_rows.drop(columns=["Stress Level"]))